@@ -6,10 +6,14 @@ from processing.file_handler_processor import FileHandlerProcessor
 from processing.file_processor import FileProcessor
 from stackspot_ai.prompts_manager import PromptsManager
 from stackspot_ai.remote_quick_command_manager import QuickCommandManager
+from stackspot_ai.result_cache import get_result_cache
 from stackspot_ai.token_manager import TokenManager
 from view.business_documentation import BusinessDocumentation
 from processing.class_processor import CSharpDependencyAnalyzer
 from processing.file_index_processor import CSFileIndexer
+from processing.index_watcher import IndexWatcher, get_index_watcher
+from processing.project_model import default_index_path
+from processing.symbol_index import SymbolIndex, get_symbol_index
 
 # Carregar as variáveis do arquivo .env
 load_dotenv()
@@ -18,6 +22,10 @@ execute_slug = os.getenv('EXECUTE_SLUG')
 account_slug = os.getenv('ACCOUNT_SLUG')
 client_id = os.getenv('CLIENT_ID')
 client_secret = os.getenv('CLIENT_SECRET')
+# Arquivo opcional para compartilhar o token entre sessões e processos
+token_cache_path = os.getenv('TOKEN_CACHE_PATH')
+# Versão do modelo usada na chave do cache de respostas: altere para descartar respostas antigas
+model_tag = os.getenv('MODEL_TAG', '')
 
 # Configuração da página
 st.set_page_config(
@@ -64,7 +72,8 @@ tab1, tab2 = st.tabs(["Home", "Ajuda"])
 token_manager = TokenManager(
     account_slug,
     client_id,
-    client_secret
+    client_secret,
+    cache_path=token_cache_path
 )
 
 # Inicializando o QuickCommandManager
@@ -77,7 +86,11 @@ quick_command_manager = QuickCommandManager(
 prompts_manager = PromptsManager()
 file_handler_processor = FileHandlerProcessor()
 
-analyzer = CSharpDependencyAnalyzer(loads.load_data("file-to-analyze/index.json"))
+symbol_index_path = default_index_path("file-to-analyze")
+analyzer = CSharpDependencyAnalyzer(
+    loads.load_data("file-to-analyze/index.json"),
+    symbol_index=get_symbol_index(symbol_index_path) if os.path.exists(symbol_index_path) else None
+)
 
 # Inicializando o FileProcessor
 processor = FileProcessor(
@@ -86,13 +99,38 @@ processor = FileProcessor(
     token_manager=token_manager,
     prompts_manager=prompts_manager,
     quick_command_manager=quick_command_manager,
-    file_handler_processor=file_handler_processor
+    file_handler_processor=file_handler_processor,
+    result_cache=get_result_cache(),
+    model_tag=model_tag
 )
 
 file_index_processor = CSFileIndexer(
     base_path="file-to-analyze"
 )
 
+def create_index_watcher(base_path, db_path):
+    """Cria o monitor da pasta do projeto (registrado uma única vez por processo do Streamlit)."""
+    def refresh_index_json(summary):
+        # Mantém o index.json usado pela busca de arquivos em sincronia com o índice de símbolos
+        loads.save_data(os.path.join(base_path, "index.json"), watcher.symbol_index.files())
+        print(f"Índice atualizado pelo monitor: {summary}")
+
+    watcher = IndexWatcher(
+        base_path,
+        SymbolIndex(db_path),
+        should_ignore=file_index_processor.should_ignore,
+        on_change=refresh_index_json
+    )
+    return watcher
+
+if st.sidebar.toggle("Monitorar alterações em 'file-to-analyze'", key="watch_project"):
+    get_index_watcher("file-to-analyze", lambda: create_index_watcher("file-to-analyze", symbol_index_path)).start()
+else:
+    # Só interrompe um monitor já criado; não cria um apenas para pará-lo
+    running_watcher = get_index_watcher("file-to-analyze")
+    if running_watcher:
+        running_watcher.stop()
+
 doc = BusinessDocumentation(
     file_processor=processor,
     class_processor=analyzer,
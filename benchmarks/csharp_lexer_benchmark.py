@@ -0,0 +1,45 @@
+"""
+Compara o tempo de extração de dependências dos backends 'regex' e 'lexer'
+dos dois analisadores C#.
+
+Uso:
+    python -m benchmarks.csharp_lexer_benchmark [pasta_do_projeto] [repeticoes]
+"""
+import sys
+import time
+from processing.class_processor import CSharpClassAnalyzer as FlatAnalyzer
+from processing.class_processor_v2 import CSharpClassAnalyzer as TypedAnalyzer
+from processing.source_cache import read_source
+from processing.symbol_index import walk_cs_files
+
+
+def measure(analyzer, contents, repeat):
+    """Retorna o melhor tempo total, em segundos, de `repeat` execuções"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in contents:
+            analyzer.extract_classes_from_content(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(project_path="file-to-analyze", repeat=3):
+    contents = [read_source(path) for _, path in walk_cs_files(project_path)]
+    if not contents:
+        print(f"Nenhum arquivo .cs encontrado em '{project_path}'.")
+        return
+    total_bytes = sum(len(content) for content in contents)
+    print(f"{len(contents)} arquivos, {total_bytes / 1024:.0f} KiB, melhor de {repeat} execuções\n")
+
+    for label, analyzer_class in (("class_processor", FlatAnalyzer), ("class_processor_v2", TypedAnalyzer)):
+        regex_time = measure(analyzer_class(backend='regex'), contents, repeat)
+        lexer_time = measure(analyzer_class(backend='lexer'), contents, repeat)
+        print(
+            f"{label:<20} regex: {regex_time * 1000:9.1f} ms   lexer: {lexer_time * 1000:9.1f} ms   "
+            f"ganho: {regex_time / lexer_time:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,45 @@
+"""
+Compara o pré-processamento original do FileHandlerProcessor (cadeia de
+regex: usings, linhas em branco, comentários #, //, /* */, código morto e
+espaços) com o minificador C# de uma passada, em tempo e em caracteres
+enviados no prompt.
+
+Uso:
+    python -m benchmarks.csharp_minifier_benchmark [pasta_do_projeto] [repeticoes]
+"""
+import sys
+import time
+from processing.csharp_minifier import minify_csharp
+from processing.file_handler_processor import minify, remove_comments, remove_dead_code, remove_using_lines
+from processing.source_cache import read_source
+from processing.symbol_index import walk_cs_files
+
+
+def regex_chain(code):
+    """Sequência original de FileHandlerProcessor.process, usada como referência"""
+    return minify(remove_dead_code(remove_comments(remove_using_lines(code))))
+
+
+def measure(function, repeat):
+    """Retorna o melhor tempo, em segundos, de `repeat` execuções"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(project_path="file-to-analyze", repeat=3):
+    sources = [read_source(path) for _, path in walk_cs_files(project_path)]
+    total = sum(len(source) for source in sources)
+    print(f"{len(sources)} arquivos, {total} caracteres, melhor de {repeat} execuções\n")
+
+    for name, function in (("cadeia de regex", regex_chain), ("minificador C#", minify_csharp)):
+        elapsed = measure(lambda: [function(source) for source in sources], repeat)
+        size = sum(len(function(source)) for source in sources)
+        print(f"{name:16} {elapsed * 1000:9.1f} ms   {size:10d} caracteres ({size / total:6.1%})")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(arg) for arg in sys.argv[2:3]])
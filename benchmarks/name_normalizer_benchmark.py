@@ -0,0 +1,65 @@
+"""
+Compara a remoção sequencial de stop words original (uma regex compilada por
+palavra a cada chamada) com o NameNormalizer e confere que os resultados são
+idênticos.
+
+Uso:
+    python -m benchmarks.name_normalizer_benchmark [pasta_do_projeto] [repeticoes]
+"""
+import re
+import sys
+import time
+from processing.name_normalizer import STOP_WORDS, NameNormalizer
+from processing.symbol_index import walk_cs_files
+
+SAMPLE_NAMES = [
+    "LimiteTaxaController.cs",
+    "user-controller-service.py",
+    "user.controller.ts",
+    "user.repository.ts",
+    "ContcontrollerRoller.cs",
+    "ſpecialKelvinService.cs",
+]
+
+
+def reference_clean_file_name(file_name, stop_words):
+    """Implementação original de clean_file_name, usada como referência"""
+    file_name = re.sub(r'\.\w+$', '', file_name)
+    for word in stop_words:
+        pattern = re.compile(re.escape(word), flags=re.IGNORECASE)
+        file_name = pattern.sub('', file_name)
+    file_name = re.sub(r'[-_.\s]+', ' ', file_name).strip()
+    return file_name
+
+
+def measure(function, repeat):
+    """Retorna o melhor tempo, em segundos, de `repeat` execuções"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(project_path="file-to-analyze", repeat=3):
+    names = SAMPLE_NAMES + [name for name, _ in walk_cs_files(project_path)]
+    expected = [reference_clean_file_name(name, STOP_WORDS) for name in names]
+    actual = NameNormalizer(STOP_WORDS).normalize_many(names)
+    mismatches = [(name, e, a) for name, e, a in zip(names, expected, actual) if e != a]
+    if mismatches:
+        print(f"{len(mismatches)} nomes com resultado diferente, ex.: {mismatches[:3]}")
+        return
+
+    print(f"{len(names)} nomes, resultados idênticos, melhor de {repeat} execuções\n")
+    sequential = measure(lambda: [reference_clean_file_name(name, STOP_WORDS) for name in names], repeat)
+    # Um normalizador novo por execução, para não medir apenas o cache
+    batch = measure(lambda: NameNormalizer(STOP_WORDS).normalize_many(names), repeat)
+    print(
+        f"sequencial: {sequential * 1000:9.1f} ms   normalizer: {batch * 1000:9.1f} ms   "
+        f"ganho: {sequential / batch:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(arg) for arg in sys.argv[2:3]])
@@ -1,8 +1,22 @@
 import re
-from typing import List, Dict, Optional
+import hashlib
+import io
+import itertools
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
-import json
+import numpy as np
 from rapidfuzz import process, fuzz
+from processing.csharp_lexer import CSharpReferences, extract_references
+from processing.dependency_graph import DependencyGraph
+from processing.name_normalizer import STOP_WORDS, clean_file_name, get_normalizer
+from processing.source_cache import read_source
+from processing.layers import layer_mask, matches_patterns, patterns_mask, unknown_patterns
+from processing.symbol_index import SymbolIndex, index_key
+from utils.json_stream import JsonStreamWriter
+
+# Eventos emitidos por CSharpDependencyAnalyzer.walk_dependencies
+ENTER = "enter"
+EXIT = "exit"
 
 @dataclass
 class Dependency:
@@ -24,7 +38,17 @@ class DependencyTree:
     dependencies: List[Dependency]
 
 class CSharpClassAnalyzer:
-    def __init__(self):
+    # Tipos de referência do lexer equivalentes aos padrões de regex abaixo
+    LEXER_REFERENCE_KINDS = ('instantiation', 'inheritance', 'using', 'typeof', 'field', 'generic', 'type_argument')
+
+    def __init__(self, backend: str = 'lexer'):
+        """
+        Args:
+            backend: 'lexer' (tokenizador de passada única) ou 'regex' (um padrão por vez).
+        """
+        if backend not in ('lexer', 'regex'):
+            raise ValueError(f"Backend de análise inválido: {backend}")
+        self.backend = backend
         self._patterns = {
             'main_class': r'class\s+(\w+)',
             'object_instantiation': r'new\s+([\w\.]+)\s*(?:\{[^}]*}|\([^\)]*\))?',
@@ -36,24 +60,44 @@ class CSharpClassAnalyzer:
 
     def extract_classes(self, file_path: str) -> List[str]:
         """Extrai dependências de uma classe"""
-        dependencies = set()
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                clean_content = self._remove_comments(content)
-                
-                # Aplicar os padrões de regex para capturar dependências
-                for pattern_name, pattern in self._patterns.items():
-                    matches = re.findall(pattern, clean_content)
-                    for match in matches:
-                        # Adicionar todas as capturas não vazias
-                        dependencies.update(filter(None, match))
+            return self.extract_classes_from_content(read_source(file_path))
         except FileNotFoundError:
             print(f"Erro: Arquivo {file_path} não encontrado")
         except Exception as e:
             print(f"Erro ao processar arquivo {file_path}: {str(e)}")
+        return []
+
+    def extract_classes_from_content(self, content: str) -> List[str]:
+        """Extrai dependências a partir do código fonte já lido"""
+        if self.backend == 'lexer':
+            return self.dependencies_from_references(extract_references(content))
+
+        dependencies = set()
+        clean_content = self._remove_comments(content)
+
+        # Aplicar os padrões de regex para capturar dependências
+        for pattern_name, pattern in self._patterns.items():
+            matches = re.findall(pattern, clean_content)
+            for match in matches:
+                # Adicionar todas as capturas não vazias
+                dependencies.update(filter(None, match))
+        return list(dependencies)
+
+    def dependencies_from_references(self, parsed: CSharpReferences) -> List[str]:
+        """Converte as referências emitidas pelo lexer na lista de dependências"""
+        dependencies = {}
+        for kind in self.LEXER_REFERENCE_KINDS:
+            dependencies.update(dict.fromkeys(parsed.references.get(kind, ())))
         return list(dependencies)
 
+    def find_main_class(self, content: str) -> Optional[str]:
+        """Identifica o nome da classe principal do arquivo"""
+        if self.backend == 'lexer':
+            return extract_references(content).main_class
+        match = re.search(self._patterns['main_class'], content)
+        return match.group(1) if match else None
+
     def _remove_comments(self, content: str) -> str:
         """Remove comentários do código fonte"""
         content = re.sub(r'//.*', '', content)
@@ -78,48 +122,92 @@ def find_similar_matches(query, files, threshold=60):
         })
     return results
 
-# Função auxiliar para limpar nomes de arquivos
-def clean_file_name(file_name, stop_words):
-    # Remove a extensão do arquivo
-    file_name = re.sub(r'\.\w+$', '', file_name)
-    
-    # Remove as stop_words (case insensitive) em qualquer lugar da sentença
-    for word in stop_words:
-        pattern = re.compile(re.escape(word), flags=re.IGNORECASE)
-        file_name = pattern.sub('', file_name)
-    
-    # Remove caracteres extras como hífens, underscores e espaços duplicados
-    file_name = re.sub(r'[-_.\s]+', ' ', file_name).strip()
-    
-    return file_name
+def build_similarity_table(class_names: List[str], stop_words: List[str], limit: int = 5, threshold: int = 60, block_size: int = 256, queries: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Calcula de uma vez as classes mais parecidas com cada classe do projeto.
+
+    Usa o mesmo critério de find_similar_matches (nome limpo contra os nomes
+    das classes, token_set_ratio, no máximo `limit` resultados acima de
+    `threshold`), mas com rapidfuzz.process.cdist em todos os núcleos. As
+    consultas são processadas em blocos para limitar a memória da matriz.
+    `queries` permite informar os nomes já normalizados.
+    """
+    names = list(class_names)
+    if queries is None:
+        queries = get_normalizer(tuple(stop_words)).normalize_many(names)
+    return _similarity_rows(names, queries, names, limit, threshold, block_size)
+
+def update_similarity_table(table: Dict[str, List[Tuple[str, float]]], previous_names: List[str], class_names: List[str], queries: List[str], limit: int = 5, threshold: int = 60, block_size: int = 256) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Atualiza uma tabela de build_similarity_table, calculada para `previous_names`,
+    para a lista atual de classes sem recalcular todos os pares. O resultado é
+    o mesmo de build_similarity_table(class_names, queries=queries):
+
+    - as linhas das classes novas e as que citavam uma classe removida são
+      recalculadas contra todos os nomes;
+    - as demais só são comparadas com as classes novas.
+    """
+    names = list(class_names)
+    position = {name: index for index, name in enumerate(names)}
+    query_of = dict(zip(names, queries))
+    previous = set(previous_names)
+    removed = previous - position.keys()
+    added = [name for name in names if name not in previous]
+    recompute = [
+        name for name in names
+        if name not in previous or any(match in removed for match, _ in table.get(name, ()))
+    ]
+    recompute_set = set(recompute)
+    kept = [name for name in names if name not in recompute_set]
+
+    updated = {name: list(table.get(name, ())) for name in kept}
+    if added and kept:
+        for name, row in _similarity_rows(kept, [query_of[name] for name in kept], added, len(added), threshold, block_size).items():
+            if row:
+                # Mesmo critério de desempate de build_similarity_table: a ordem em class_names
+                merged = sorted(updated[name] + row, key=lambda match: (-match[1], position[match[0]]))
+                updated[name] = merged[:limit]
+    updated.update(_similarity_rows(recompute, [query_of[name] for name in recompute], names, limit, threshold, block_size))
+    return updated
+
+def _similarity_rows(query_names: List[str], queries: List[str], names: List[str], limit: int, threshold: int, block_size: int) -> Dict[str, List[Tuple[str, float]]]:
+    """As `limit` classes de `names` mais parecidas com cada consulta, em blocos de `block_size` consultas"""
+    table = {}
+    if not names:
+        return {name: [] for name in query_names}
+    for start in range(0, len(query_names), block_size):
+        scores = process.cdist(
+            queries[start:start + block_size],
+            names,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=threshold,
+            dtype=np.float64,
+            workers=-1,
+        )
+        for offset, row in enumerate(scores):
+            candidates = np.flatnonzero(row >= threshold)
+            # Maior pontuação primeiro; empates na ordem original, como em process.extract
+            best = candidates[np.argsort(-row[candidates], kind='stable')][:limit]
+            table[query_names[start + offset]] = [(names[index], float(row[index])) for index in best]
+    return table
 
 class CSharpDependencyAnalyzer:
-    def __init__(self, json_data: List[Dict[str, str]]):
+    def __init__(self, json_data: List[Dict[str, str]], symbol_index: Optional[SymbolIndex] = None):
         self.json_data = json_data
+        self.symbol_index = symbol_index
         self.class_analyzer = CSharpClassAnalyzer()
         self.class_files: Dict[str, str] = self._map_classes_from_json()
         self.visited_files = set()  # Rastreamento de arquivos já processados
         self.main_class_name: Optional[str] = None  # Nome da classe principal para análise de similaridade
-        self.stop_words = [
-            "controller", "model", "view", "api", "service", "resource", "event", "handler",
-            "listener", "microservice", "gateway", "proxy", "repository", "entity", "dto",
-            "dao", "aggregate", "valueobject", "factory", "specification", "test", "spec",
-            "mock", "stub", "fixture", "component", "directive", "module", "widget",
-            "middleware", "interceptor", "adapter", "logger", "monitor", "metrics", "auth",
-            "authorization", "authentication", "token", "config", "settings", "env",
-            "deployment", "schema", "migration", "seeder", "index", "layout", "template",
-            "style", "theme", "helper", "util", "common", "base", "core", "Controller", "Model", "View", "Api", "Service", "Resource", "Event", "Handler",
-            "Listener", "Microservice", "Gateway", "Proxy", "Repository", "Entity", "Dto",
-            "Dao", "Aggregate", "Valueobject", "Factory", "Specification", "Test", "Spec",
-            "Mock", "Stub", "Fixture", "Component", "Directive", "Module", "Widget",
-            "Middleware", "Interceptor", "Adapter", "Logger", "Monitor", "Metrics", "Auth",
-            "Authorization", "Authentication", "Token", "Config", "Settings", "Env",
-            "Deployment", "Schema", "Migration", "Seeder", "Index", "Layout", "Template",
-            "Style", "Theme", "Helper", "Util", "Common", "Base", "Core"
-        ]
+        self._similarity_table: Optional[Dict[str, List[Tuple[str, float]]]] = None
+        self._layer_masks: Optional[Dict[str, int]] = None
+        self.stop_words = list(STOP_WORDS)
 
     def _map_classes_from_json(self) -> Dict[str, str]:
         """Mapeia as classes para seus arquivos com base no JSON"""
+        if self._has_symbol_index():
+            return self.symbol_index.class_files()
+
         class_files = {}
         for entry in self.json_data:
             file_path = entry['path']
@@ -129,7 +217,55 @@ class CSharpDependencyAnalyzer:
         return class_files
 
     def analyze_dependencies_tree(self, file_path: str, max_depth: int = 0, current_depth: int = 0, selected_patterns = []) -> Optional[Dependency]:
-        """Analisa recursivamente as dependências de uma classe"""
+        """Analisa as dependências de uma classe, montando a árvore de Dependency"""
+        root = None
+        stack: List[Dependency] = []
+        for event, path in self.walk_dependencies(file_path, max_depth, current_depth, selected_patterns):
+            if event == EXIT:
+                stack.pop()
+                continue
+            node = Dependency(
+                path=path,
+                methods=[],  # Métodos podem ser extraídos se necessário
+                subdependencies=[]
+            )
+            if stack:
+                stack[-1].subdependencies.append(node)
+            else:
+                root = node
+            stack.append(node)
+        return root
+
+    def walk_dependencies(self, file_path: str, max_depth: int = 0, current_depth: int = 0, selected_patterns = []) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Percorre as dependências em profundidade com uma pilha explícita (sem
+        limite de recursão), emitindo (ENTER, caminho) ao entrar em uma classe
+        e (EXIT, None) ao terminar as suas subdependências.
+
+        A ordem e os arquivos visitados são os mesmos da versão recursiva: um
+        arquivo já visitado em outro ramo não é repetido.
+        """
+        # Máscara das camadas selecionadas e padrões fora da lista: calculados uma vez por relatório
+        layer_selection = (patterns_mask(selected_patterns), unknown_patterns(selected_patterns))
+        frame = self._enter_dependency(file_path, current_depth, max_depth, layer_selection)
+        if frame is None:
+            return
+        yield ENTER, file_path
+        stack = [frame]
+        while stack:
+            depth, candidates = stack[-1]
+            for dep_file_path in candidates:
+                child = self._enter_dependency(dep_file_path, depth + 1, max_depth, layer_selection)
+                if child is not None:
+                    yield ENTER, dep_file_path
+                    stack.append(child)
+                    break
+            else:
+                stack.pop()
+                yield EXIT, None
+
+    def _enter_dependency(self, file_path: str, current_depth: int, max_depth: int, layer_selection: Tuple[int, List[str]]) -> Optional[Tuple[int, Iterator[str]]]:
+        """Marca o arquivo como visitado e retorna a profundidade e os candidatos a subdependência"""
         if current_depth > max_depth:
             return None
 
@@ -147,86 +283,216 @@ class CSharpDependencyAnalyzer:
             self.main_class_name = class_name
 
         # Busca dependências por regex
-        regex_dependencies = self.class_analyzer.extract_classes(file_path)
+        regex_dependencies = self._extract_dependencies(file_path)
         # Busca dependências por similaridade com base na main_class_name
         similar_dependencies = self._find_similar_dependencies(self.main_class_name)
 
-        dependency_objects = []
-        
-        # Processar dependências encontradas por regex
-        for dep_class in regex_dependencies:
-            dep_file_path = self.class_files.get(dep_class)
-            if dep_file_path and self._is_valid_dependency(dep_file_path, selected_patterns=selected_patterns):
-                nested_dependency = self.analyze_dependencies_tree(dep_file_path, max_depth, current_depth + 1, selected_patterns=selected_patterns)
-                if nested_dependency:
-                    dependency_objects.append(nested_dependency)
-
-        # Processar dependências encontradas por similaridade
-        for dep in similar_dependencies:
-            dep_file_path = dep["match"]["path"]
-            if self._is_valid_dependency(dep_file_path, selected_patterns=selected_patterns):
-                nested_dependency = self.analyze_dependencies_tree(dep_file_path, max_depth, current_depth + 1, selected_patterns=selected_patterns)
-                if nested_dependency:
-                    dependency_objects.append(nested_dependency)
-
-        return Dependency(
-            path=file_path,
-            methods=[],  # Métodos podem ser extraídos se necessário
-            subdependencies=dependency_objects
+        # Dependências por regex primeiro, depois as por similaridade; a validade é verificada ao percorrer
+        candidates = itertools.chain(
+            (self.class_files.get(dep_class) for dep_class in regex_dependencies),
+            (dep["match"]["path"] for dep in similar_dependencies),
+        )
+        return current_depth, (
+            dep_file_path for dep_file_path in candidates
+            if dep_file_path and self._is_valid_dependency(dep_file_path, layer_selection)
         )
 
     def _find_similar_dependencies(self, main_class_name: str) -> List[Dict]:
-        """Encontra dependências similares usando a função find_similar_matches"""
-        print(f"main_class: {clean_file_name(main_class_name, self.stop_words)}")
+        """Encontra dependências similares consultando a tabela de similaridade pré-calculada"""
         if not main_class_name:
             return []
-        files = [{"file_name": key, "path": value} for key, value in self.class_files.items()]
-        print(f"similares: {find_similar_matches(clean_file_name(main_class_name, self.stop_words), files, threshold=60)}")
-        return find_similar_matches(clean_file_name(main_class_name, self.stop_words), files, threshold=60)
+        table = self._get_similarity_table()
+        if main_class_name not in table:
+            files = [{"file_name": key, "path": value} for key, value in self.class_files.items()]
+            table[main_class_name] = [
+                (result["match"]["file_name"], result["score"])
+                for result in find_similar_matches(clean_file_name(main_class_name, self.stop_words), files, threshold=60)
+            ]
+        return [
+            {"match": {"file_name": name, "path": self.class_files[name]}, "score": score}
+            for name, score in table[main_class_name]
+        ]
+
+    def _get_similarity_table(self) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Carrega a tabela de similaridade do índice ou a calcula, salvando-a ao
+        lado do índice; se o conjunto de classes mudou desde a última tabela
+        salva, atualiza apenas as linhas afetadas.
+        """
+        if self._similarity_table is not None:
+            return self._similarity_table
+
+        class_names = list(self.class_files)
+        signature = hashlib.sha1(
+            "\n".join(class_names + ["--"] + self.stop_words).encode('utf-8', 'surrogateescape')
+        ).hexdigest()
+        table = self.symbol_index.similarities(signature) if self._has_symbol_index() else None
+        if table is None:
+            queries = self._normalized_class_names(class_names)
+            words_signature = get_normalizer(tuple(self.stop_words)).signature
+            previous = self.symbol_index.previous_similarities(words_signature) if self._has_symbol_index() else None
+            if previous is not None:
+                # Classes adicionadas ou removidas: recalcula só as linhas afetadas
+                table = update_similarity_table(previous[1], previous[0], class_names, queries)
+            else:
+                table = build_similarity_table(class_names, self.stop_words, queries=queries)
+            if self._has_symbol_index():
+                self.symbol_index.save_similarities(signature, table, class_names, words_signature)
+        # Classes sem nenhuma semelhante não têm linhas salvas
+        for name in class_names:
+            table.setdefault(name, [])
+        self._similarity_table = table
+        return table
+
+    def _normalized_class_names(self, class_names: List[str]) -> List[str]:
+        """Normaliza os nomes em lote, reaproveitando os que já estão salvos no índice"""
+        normalizer = get_normalizer(tuple(self.stop_words))
+        if not self._has_symbol_index():
+            return normalizer.normalize_many(class_names)
+
+        saved = self.symbol_index.normalized_names(normalizer.signature)
+        missing = [name for name in class_names if name not in saved]
+        if missing:
+            computed = dict(zip(missing, normalizer.normalize_many(missing)))
+            self.symbol_index.save_normalized_names(normalizer.signature, computed)
+            saved.update(computed)
+        return [saved[name] for name in class_names]
+
+    def _has_symbol_index(self) -> bool:
+        return self.symbol_index is not None and not self.symbol_index.is_empty()
+
+    def _extract_dependencies(self, file_path: str) -> List[str]:
+        """Consulta as referências no índice de símbolos, lendo o arquivo apenas se não estiver indexado"""
+        if self.symbol_index is not None and self.symbol_index.contains(file_path):
+            return self.symbol_index.references(file_path).get('reference', [])
+        return self.class_analyzer.extract_classes(file_path)
 
     def _extract_class_name(self, file_path: str) -> Optional[str]:
         """Extrai o nome da classe principal do arquivo"""
+        if self.symbol_index is not None and self.symbol_index.contains(file_path):
+            return self.symbol_index.class_name(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                match = re.search(r'class\s+(\w+)', content)
-                return match.group(1) if match else None
+            return self.class_analyzer.find_main_class(read_source(file_path))
         except Exception:
             return None
         
-    def _is_valid_dependency(self, file_path: str, selected_patterns = []) -> bool:
-        """Verifica se o arquivo atende aos padrões desejados"""
-        # Lista de palavras-chave que indicam dependências válidas
-        print(f"selected patterns: {selected_patterns}")
-        keywords = selected_patterns
-        
-        # Extrai o nome do arquivo sem o caminho completo
-        # file_name = file_path.split("/")[-1]  # Para sistemas Unix-like
-        # file_name = file_path.split("\")[-1]  # Para sistemas Windows (se necessário)
-        
-        # Remove a extensão do arquivo, se houver
-        file_name = re.sub(r'\.\w+$', '', file_path)
-        
-        # Verifica se alguma das palavras-chave está presente no nome do arquivo (case insensitive)
-        return any(re.search(rf'\b{keyword}\b', file_name, flags=re.IGNORECASE) for keyword in keywords)
+    def _is_valid_dependency(self, file_path: str, layer_selection: Tuple[int, List[str]]) -> bool:
+        """
+        Verifica se o arquivo pertence a alguma das camadas (padrões de nomenclatura) selecionadas.
+        layer_selection é o par (máscara das camadas, padrões fora da lista) montado em walk_dependencies.
+        """
+        if self._layer_masks is None:
+            self._layer_masks = self.symbol_index.layer_masks() if self._has_symbol_index() else {}
+
+        key = index_key(file_path)
+        mask = self._layer_masks.get(key)
+        if mask is None:
+            mask = self._layer_masks[key] = layer_mask(file_path)
+        selected_mask, extra_patterns = layer_selection
+        if mask & selected_mask:
+            return True
+        # Padrões fora da lista de camadas não têm bit na máscara
+        return bool(extra_patterns) and matches_patterns(file_path, extra_patterns)
 
     def generate_json_report(self, main_class_path: str, max_depth: int = 0, selected_patterns = []) -> str:
         """Gera o JSON na estrutura solicitada"""
-        main_class_name = self._extract_class_name(main_class_path)
-        if not main_class_name:
-            return json.dumps({"error": "Main class not found"}, indent=2)
+        output = io.StringIO()
+        self.write_json_report(output, main_class_path, max_depth, selected_patterns)
+        return output.getvalue()
+
+    def build_json_report(self, main_class_path: str, max_depth: int = 0, selected_patterns = []) -> Dict:
+        """Mesma estrutura de generate_json_report, já como dicionário (sem serializar e ler de volta)"""
+        if not self._extract_class_name(main_class_path):
+            return {"error": "Main class not found"}
+
+        self.visited_files.clear()
+        dependencies = []
+        stack = []
+        paths = []
+        for event, path in self.walk_dependencies(main_class_path, max_depth=max_depth, selected_patterns=selected_patterns):
+            if event == EXIT:
+                stack.pop()
+                continue
+            paths.append(path)
+            node = {"path": path, "methods": [], "subdependencies": []}
+            if len(stack) == 1:
+                dependencies.append(node)
+            elif stack:
+                stack[-1]["subdependencies"].append(node)
+            stack.append(node)
+        return {
+            "main_class": {"path": main_class_path, "methods": []},
+            "dependencies": dependencies,
+            "documentation_order": self.documentation_order(paths),
+        }
+
+    def write_json_report(self, fp, main_class_path: str, max_depth: int = 0, selected_patterns = []) -> None:
+        """
+        Escreve o relatório JSON em `fp` (arquivo ou `socket.makefile("w")`)
+        à medida que as dependências são percorridas, sem montar a árvore:
+        além da profundidade, só a lista de caminhos (para a ordem de
+        documentação) cresce com o tamanho da árvore.
+        """
+        writer = JsonStreamWriter(fp, indent=2)
+        if not self._extract_class_name(main_class_path):
+            writer.value({"error": "Main class not found"})
+            writer.close()
+            return
 
-        main_class = MainClass(
+        writer.begin_object()
+        writer.key("main_class")
+        writer.value(MainClass(
             path=main_class_path,
             methods=[]  # Métodos podem ser extraídos se necessário
-        )
+        ))
+        writer.key("dependencies")
+        writer.begin_array()
 
         # Limpar o conjunto de arquivos visitados antes de iniciar a análise
         self.visited_files.clear()
-        dependencies = self.analyze_dependencies_tree(main_class_path, max_depth=max_depth, selected_patterns=selected_patterns)
-        
-        dependency_tree = DependencyTree(
-            main_class=main_class,
-            dependencies=dependencies.subdependencies if dependencies else []
-        )
-        return json.dumps(dependency_tree, default=lambda o: o.__dict__, indent=2)
\ No newline at end of file
+        depth = 0
+        paths = []
+        for event, path in self.walk_dependencies(main_class_path, max_depth=max_depth, selected_patterns=selected_patterns):
+            if event == EXIT:
+                depth -= 1
+                if depth:
+                    writer.end_array()
+                    writer.end_object()
+                continue
+            paths.append(path)
+            if depth:
+                # A classe principal (profundidade 0) não é escrita: as suas subdependências formam "dependencies"
+                writer.begin_object()
+                writer.key("path")
+                writer.value(path)
+                writer.key("methods")
+                writer.value([])
+                writer.key("subdependencies")
+                writer.begin_array()
+            depth += 1
+
+        writer.end_array()
+        writer.key("documentation_order")
+        writer.value(self.documentation_order(paths))
+        writer.end_object()
+        writer.close()
+
+    def documentation_order(self, paths: List[str]) -> List[List[Dict]]:
+        """
+        Ordem de documentação dos arquivos de um relatório, das folhas para a
+        classe principal, considerando as referências entre eles. Classes com
+        dependência mútua formam uma única unidade, marcada com "cycle"; as
+        unidades de um mesmo nível podem ser documentadas em paralelo.
+        """
+        paths = list(dict.fromkeys(paths))
+        node_of = {index_key(path): node for node, path in enumerate(paths)}
+        adjacency = []
+        for path in paths:
+            dependency_paths = (self.class_files.get(name) for name in self._extract_dependencies(path))
+            adjacency.append([
+                node_of[index_key(dependency_path)] for dependency_path in dependency_paths
+                if dependency_path and index_key(dependency_path) in node_of
+            ])
+        names = [self._extract_class_name(path) or path for path in paths]
+        graph = DependencyGraph.from_adjacency(names, paths, adjacency)
+        return graph.documentation_order(graph.condense())
@@ -1,8 +1,13 @@
 import os
 import re
-from typing import Set, Optional, Dict, List
+from typing import Set, Optional, Dict, Iterable, Iterator, List, Tuple
 from dataclasses import dataclass
 import json
+from processing.csharp_lexer import CSharpReferences, extract_references
+from processing.source_cache import read_source
+from processing.dependency_graph import TRAVERSAL_KINDS, DependencyGraph
+from processing.project_model import ProjectModel, get_project_model
+from processing.symbol_index import SymbolIndex
 
 @dataclass
 class ClassDependency:
@@ -21,7 +26,23 @@ class ImplementationInfo:
     dependencies: Dict[str, Set[str]]
 
 class CSharpClassAnalyzer:
-    def __init__(self):
+    # Tipos de referência do lexer equivalentes a cada padrão de regex, na mesma ordem de precedência
+    LEXER_PATTERN_KINDS = {
+        'variable_declaration': ('declaration', 'field'),
+        'generic_declaration': ('generic',),
+        'object_instantiation': ('instantiation',),
+        'inheritance': ('inheritance',),
+        'static_usage': ('static',),
+    }
+
+    def __init__(self, backend: str = 'lexer'):
+        """
+        Args:
+            backend: 'lexer' (tokenizador de passada única) ou 'regex' (um padrão por vez).
+        """
+        if backend not in ('lexer', 'regex'):
+            raise ValueError(f"Backend de análise inválido: {backend}")
+        self.backend = backend
         self._patterns = {
             'main_class': r'class\s+(\w+)',
             'variable_declaration': r'(\w+)\s+\w+\s*[=;]',
@@ -35,38 +56,58 @@ class CSharpClassAnalyzer:
 
     def extract_classes(self, file_path: str) -> Dict[str, Set[str]]:
         """Extrai informações sobre classes e interfaces implementadas"""
-        dependencies = {'instance': set(), 'static': set(), 'inheritance': set(), 'interfaces': set()}
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-
-            clean_content = self._remove_comments(content)
-            main_class = self._find_main_class(clean_content)
-
-            self._process_dependencies(clean_content, main_class, dependencies)
+            return self.extract_classes_from_content(read_source(file_path))
 
         except FileNotFoundError:
             print(f"Erro: Arquivo {file_path} não encontrado")
         except Exception as e:
             print(f"extract_classes -> Erro ao processar arquivo: {str(e)}")
 
+        return {'instance': set(), 'static': set(), 'inheritance': set(), 'interfaces': set()}
+
+    def extract_classes_from_content(self, content: str) -> Dict[str, Set[str]]:
+        """Extrai as dependências a partir do código fonte já lido"""
+        if self.backend == 'lexer':
+            return self.dependencies_from_references(extract_references(content))
+
+        dependencies = {'instance': set(), 'static': set(), 'inheritance': set(), 'interfaces': set()}
+        clean_content = self._remove_comments(content)
+        main_class = self._find_main_class(clean_content)
+        self._process_dependencies(self._regex_matches(clean_content), main_class, dependencies)
         return dependencies
 
-    def _process_dependencies(self, content: str, main_class: Optional[str], dependencies: Dict[str, Set[str]]) -> None:
-        """Processa todas as dependências de uma classe."""
-        seen_classes = set()
+    def dependencies_from_references(self, parsed: CSharpReferences) -> Dict[str, Set[str]]:
+        """Converte as referências emitidas pelo lexer no formato de dependências por tipo"""
+        dependencies = {'instance': set(), 'static': set(), 'inheritance': set(), 'interfaces': set()}
+        matches = (
+            (pattern_name, name)
+            for pattern_name, kinds in self.LEXER_PATTERN_KINDS.items()
+            for kind in kinds
+            for name in parsed.references.get(kind, ())
+        )
+        self._process_dependencies(matches, parsed.main_class, dependencies)
+        return dependencies
+
+    def _regex_matches(self, content: str) -> Iterator[Tuple[str, Optional[str]]]:
+        """Aplica cada padrão de regex ao conteúdo, um de cada vez."""
         for pattern_name, pattern in self._patterns.items():
             if pattern_name in ['main_class', 'interface_implementation']:
                 continue
-
             for match in re.finditer(pattern, content):
-                class_name = self._sanitize_generic_class_name(match.group(1))
-                if class_name and class_name not in seen_classes:
-                    seen_classes.add(class_name)
-                    if class_name.startswith('I'):
-                        dependencies['interfaces'].add(class_name)
-                    elif self._is_valid_dependency(class_name, main_class):
-                        dependencies[self._get_dependency_type(pattern_name)].add(class_name)
+                yield pattern_name, match.group(1)
+
+    def _process_dependencies(self, matches: Iterable[Tuple[str, Optional[str]]], main_class: Optional[str], dependencies: Dict[str, Set[str]]) -> None:
+        """Processa todas as dependências de uma classe."""
+        seen_classes = set()
+        for pattern_name, raw_name in matches:
+            class_name = self._sanitize_generic_class_name(raw_name)
+            if class_name and class_name not in seen_classes:
+                seen_classes.add(class_name)
+                if class_name.startswith('I'):
+                    dependencies['interfaces'].add(class_name)
+                elif self._is_valid_dependency(class_name, main_class):
+                    dependencies[self._get_dependency_type(pattern_name)].add(class_name)
     
     def _sanitize_generic_class_name(self, class_name: Optional[str]) -> str:
         """Converte a definição genérica do nome da classe para '<T>' se existir."""
@@ -98,6 +139,8 @@ class CSharpClassAnalyzer:
 
     def _find_main_class(self, content: str) -> Optional[str]:
         """Identifica o nome da classe principal do arquivo."""
+        if self.backend == 'lexer':
+            return extract_references(content).main_class
         main_class_match = re.search(self._patterns['main_class'], content)
         return main_class_match.group(1) if main_class_match else None
 
@@ -116,30 +159,48 @@ class CSharpClassAnalyzer:
         )
 
 class CSharpDependencyAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, symbol_index: Optional[SymbolIndex] = None, max_workers: Optional[int] = None, revalidate_model: bool = True):
         self.project_root = project_root
+        self.max_workers = max_workers
+        self.revalidate_model = revalidate_model
         self.class_analyzer = CSharpClassAnalyzer()
         self.processed_classes: Dict[str, ClassDependency] = {}
         self.class_files: Dict[str, str] = {}
         self.processed_class_implementations = set()
+        self.symbol_index = symbol_index
+        self.model: Optional[ProjectModel] = None
 
     def initialize(self):
-        """Mapeia todas as classes do projeto para seus arquivos"""
-        for root, _, files in os.walk(self.project_root):
-            for file in files:
-                if file.endswith('.cs'):
-                    file_path = os.path.join(root, file)
-                    class_name = self._extract_class_name(file_path)
-                    if class_name:
-                        self.class_files[class_name] = file_path
+        """Mapeia todas as classes do projeto para seus arquivos, reaproveitando o modelo em cache"""
+        self.model = get_project_model(self.project_root, self.symbol_index, self.max_workers, self.revalidate_model)
+        self.symbol_index = self.model.symbol_index
+        self.class_files = self.model.class_files
 
     def analyze_dependencies_tree(self, controller_path: str, max_depth: int = 10) -> ClassDependency:
         """Analisa a árvore de dependências começando de um controller."""
         self.initialize()
-        self._process_file(controller_path, 0, max_depth)
+        graph = self.model.dependency_graph()
+        start = graph.node_for_path(controller_path)
+        if start is None:
+            # Arquivo fora do índice: percorre as dependências lendo os arquivos
+            self._process_file(controller_path, 0, max_depth)
+        else:
+            for node, level in graph.bfs(start, max_depth):
+                if graph.names[node] not in self.processed_classes:
+                    self.processed_classes[graph.names[node]] = self._class_dependency(graph, node, level)
         main_class_name = self._extract_class_name(controller_path)
         return self.processed_classes.get(main_class_name, None)
 
+    def _class_dependency(self, graph: DependencyGraph, node: int, level: int) -> ClassDependency:
+        references = graph.references[node]
+        return ClassDependency(
+            name=graph.names[node],
+            file_path=graph.paths[node],
+            dependencies={kind: set(references.get(kind, ())) for kind in ('instance', 'static', 'inheritance')},
+            interfaces=set(references.get('interfaces', ())),
+            level=level
+        )
+
     def _process_file(self, file_path: str, current_level: int, max_depth: int) -> None:
         """Processa recursivamente um arquivo e suas dependências."""
         if current_level >= max_depth:
@@ -147,7 +208,7 @@ class CSharpDependencyAnalyzer:
 
         class_name = self._extract_class_name(file_path)
         if class_name and class_name not in self.processed_classes:
-            dependencies = self.class_analyzer.extract_classes(file_path)
+            dependencies = self._extract_dependencies(file_path)
             interfaces = dependencies.get('interfaces', set())
             dependencies.pop('interfaces')
             self.processed_classes[class_name] = ClassDependency(
@@ -162,12 +223,22 @@ class CSharpDependencyAnalyzer:
                 if dep_class in self.class_files:
                     self._process_file(self.class_files[dep_class], current_level + 1, max_depth)
 
+    def _extract_dependencies(self, file_path: str) -> Dict[str, Set[str]]:
+        """Consulta as dependências no índice de símbolos, lendo o arquivo apenas se não estiver indexado"""
+        if self.symbol_index is None or not self.symbol_index.contains(file_path):
+            return self.class_analyzer.extract_classes(file_path)
+        references = self.symbol_index.references(file_path)
+        return {
+            kind: set(references.get(kind, ()))
+            for kind in ('instance', 'static', 'inheritance', 'interfaces')
+        }
+
     def _extract_class_name(self, file_path: str) -> Optional[str]:
         """Extrai o nome da classe principal do arquivo"""
+        if self.symbol_index is not None and self.symbol_index.contains(file_path):
+            return self.symbol_index.class_name(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            return self.class_analyzer._find_main_class(content)
+            return self.class_analyzer._find_main_class(read_source(file_path))
         except Exception:
             return None
 
@@ -199,15 +270,38 @@ class CSharpDependencyAnalyzer:
                         "file_path": impl.file_path
                     })
 
+        dependencies = self.remove_duplicates_by_key(self.remove_unknown_values(dependent_classes), 'class_name')
         controller_json = {
             "controller": {
                 "name": controller_dependency.name,
                 "file_path": controller_dependency.file_path,
-                "dependencies": self.remove_duplicates_by_key(self.remove_unknown_values(dependent_classes), 'class_name'),
-            }
+                "dependencies": dependencies,
+            },
+            "documentation_order": self.documentation_plan(dependency["class_name"] for dependency in dependencies),
         }
         return json.dumps(controller_json, indent=2)
     
+    def documentation_plan(self, class_names: Iterable[str] = ()) -> List[List[Dict]]:
+        """
+        Ordem de documentação das classes da última árvore analisada (mais
+        `class_names`, como as dependências listadas no relatório), das folhas
+        para o controller. As implementações das interfaces usadas entram na
+        ordem, ligadas a quem depende da interface.
+
+        Classes com dependência mútua (componentes fortemente conexas) formam
+        uma única unidade, marcada com "cycle"; cada nível depende apenas dos
+        anteriores, então as unidades de um mesmo nível podem ser documentadas
+        em paralelo.
+        """
+        if self.model is None or not self.processed_classes:
+            return []
+        graph = self.model.dependency_graph()
+        names = list(dict.fromkeys([*self.processed_classes, *class_names]))
+        nodes = [graph.node_ids[name] for name in names if name in graph.node_ids]
+        # Implementações resolvidas por injeção de dependência (IPedidoBusiness -> PedidoBusiness)
+        nodes += [target for node in nodes for target, _ in graph.edges(node, ('interface',))]
+        return graph.documentation_order(graph.condense(nodes, TRAVERSAL_KINDS + ('interface',)))
+
     def remove_duplicates_by_key(self, lista_dicts, key_field):
         seen = set()
         unique_dicts = []
@@ -242,27 +336,21 @@ class CSharpDependencyAnalyzer:
 
     def find_interface_implementations(self, interface_name: str) -> List[ImplementationInfo]:
         """Encontra todas as implementações de uma interface específica"""
-        self.initialize()
+        if self.model is None:
+            self.initialize()
         implementations = []
 
-        interface_pattern = re.compile(rf'class\s+(\w+(?:<.*?>)?)\s*:\s*[^:]*\b{interface_name}\b', re.M)
-
-        for file_path in self.class_files.values():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    if interface_pattern.search(content):
-                        class_name = self.class_analyzer._find_main_class(content)
-                        if class_name and class_name not in self.processed_class_implementations:
-                            dependencies = self.class_analyzer.extract_classes(file_path)
-                            implementations.append(ImplementationInfo(
-                                class_name=class_name,
-                                file_path=file_path,
-                                dependencies=dependencies
-                            ))
-            except Exception as e:
-                print(f"Erro ao processar arquivo {file_path}: {str(e)}")
-        
+        # O índice de símbolos mantém a relação tipo base -> arquivos, atualizada a cada reindexação
+        for class_name, file_path in self.symbol_index.implementations(interface_name):
+            if self.class_files.get(class_name) != file_path:
+                continue
+            if class_name not in self.processed_class_implementations:
+                implementations.append(ImplementationInfo(
+                    class_name=class_name,
+                    file_path=file_path,
+                    dependencies=self._extract_dependencies(file_path)
+                ))
+
         return implementations
 
 # Exemplo de uso atualizado
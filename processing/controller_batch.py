@@ -0,0 +1,146 @@
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from processing.class_processor_v2 import CSharpDependencyAnalyzer
+from processing.parallel import pool_chunksize, resolve_workers
+from processing.project_model import get_project_model, open_project_model, reset_after_fork
+from processing.symbol_index import index_key
+from utils.loads import save_data
+
+SUMMARY_FILE = "summary.json"
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def is_batch_request(spec: Optional[str]) -> bool:
+    """
+    Indica se `controller_path` pede o modo em lote: vazio/'all', lista
+    separada por vírgulas ou quebras de linha, ou padrão glob.
+    """
+    items = [item.strip() for item in re.split(r'[,\n]', spec or '') if item.strip()]
+    return len(items) != 1 or items == ['all'] or bool(_GLOB_CHARS.search(items[0]))
+
+
+def discover_controllers(project_root: str) -> List[str]:
+    """Retorna os arquivos cuja classe principal termina em 'Controller'"""
+    class_files = get_project_model(project_root).class_files
+    return sorted(
+        {path for class_name, path in class_files.items() if class_name.endswith("Controller")},
+        key=index_key,
+    )
+
+
+def resolve_controllers(project_root: str, spec: Optional[str]) -> List[str]:
+    """
+    Converte a entrada `controller_path` na lista de controllers a analisar.
+
+    Aceita um caminho, uma lista separada por vírgulas ou quebras de linha,
+    padrões glob (ex.: '**/Controllers/*.cs') ou 'all'/vazio para descobrir
+    todos os controllers do projeto.
+    """
+    items = [item.strip() for item in re.split(r'[,\n]', spec or '') if item.strip()]
+    if not items or items == ['all']:
+        return discover_controllers(project_root)
+
+    controllers = []
+    for item in items:
+        if _GLOB_CHARS.search(item):
+            controllers.extend(sorted(glob.glob(_glob_pattern(project_root, item), recursive=True)))
+        else:
+            controllers.append(item)
+
+    # Remove repetições mantendo a ordem
+    seen = set()
+    return [path for path in controllers if not (index_key(path) in seen or seen.add(index_key(path)))]
+
+
+def _glob_pattern(project_root: str, pattern: str) -> str:
+    """Padrões relativos são resolvidos a partir da pasta do projeto, exceto se já começarem por ela"""
+    if os.path.isabs(pattern) or os.path.normpath(pattern).startswith(os.path.normpath(project_root)):
+        return pattern
+    return os.path.join(project_root, pattern)
+
+
+def _init_worker(project_root: str, db_path: str, fingerprint: str):
+    """
+    Inicializa um worker do pool: descarta o modelo herdado do processo pai
+    (a conexão SQLite não pode atravessar o fork) e abre o índice já pronto.
+    """
+    reset_after_fork()
+    open_project_model(project_root, db_path, fingerprint)
+
+
+def _analyze_controller(task: Tuple[str, str, int]) -> Dict:
+    """Gera o relatório de um controller dentro de um worker do pool de processos"""
+    project_root, controller_path, max_depth = task
+    try:
+        # O modelo foi validado antes do lote: cada processo o carrega uma única vez
+        analyzer = CSharpDependencyAnalyzer(project_root, revalidate_model=False)
+        controller_dependency = analyzer.analyze_dependencies_tree(controller_path, max_depth=max_depth)
+        report = analyzer.generate_controller_json_report(controller_dependency)
+        return {"controller_path": controller_path, "report": report, "error": None}
+    except Exception as e:
+        return {"controller_path": controller_path, "report": None, "error": str(e)}
+
+
+def _report_file_name(class_name: Optional[str], controller_path: str, used: set) -> str:
+    """Nome do relatório: nome do controller, com sufixo numérico se repetido"""
+    base = class_name or os.path.splitext(os.path.basename(controller_path))[0]
+    file_name, counter = f"{base}.json", 1
+    while file_name in used:
+        counter += 1
+        file_name = f"{base}_{counter}.json"
+    used.add(file_name)
+    return file_name
+
+
+def analyze_controllers(
+    project_root: str,
+    controller_paths: List[str],
+    output_dir: str,
+    max_depth: int = 2,
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """
+    Analisa vários controllers e grava um relatório JSON por controller e um resumo.
+
+    O modelo do projeto (índice de símbolos) é montado uma única vez antes de
+    distribuir os controllers no pool de processos; cada worker apenas carrega
+    o índice já pronto, com uma conexão própria aberta na inicialização.
+    """
+    model = get_project_model(project_root, max_workers=max_workers)
+    tasks = [(project_root, path, max_depth) for path in controller_paths]
+
+    max_workers = resolve_workers(max_workers)
+    if max_workers <= 1 or len(tasks) < 2:
+        results = [_analyze_controller(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(project_root, model.symbol_index.db_path, model.fingerprint),
+        ) as executor:
+            results = list(executor.map(_analyze_controller, tasks, chunksize=pool_chunksize(len(tasks), max_workers)))
+
+    os.makedirs(output_dir, exist_ok=True)
+    used_names = {SUMMARY_FILE}
+    summary = {"project_path": project_root, "max_depth": max_depth, "controllers": []}
+    for result in results:
+        entry = {"controller_path": result["controller_path"], "report_file": None, "error": result["error"]}
+        if result["report"] is not None:
+            report = json.loads(result["report"])
+            entry["error"] = report.get("error")
+            entry["dependencies"] = len(report.get("controller", {}).get("dependencies", []))
+            entry["report_file"] = _report_file_name(
+                report.get("controller", {}).get("name"), result["controller_path"], used_names
+            )
+            with open(os.path.join(output_dir, entry["report_file"]), 'w', encoding='utf-8') as file:
+                file.write(result["report"])
+        summary["controllers"].append(entry)
+
+    summary["analyzed"] = sum(1 for entry in summary["controllers"] if not entry["error"])
+    summary["failed"] = len(summary["controllers"]) - summary["analyzed"]
+    save_data(os.path.join(output_dir, SUMMARY_FILE), summary)
+    return summary
@@ -0,0 +1,177 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Tipos de referência emitidos pelo lexer
+REFERENCE_KINDS = (
+    'instantiation',   # new Tipo(...)
+    'inheritance',     # class X : Base, IInterface
+    'generic',         # Tipo<...> (nome externo do genérico)
+    'type_argument',   # Tipo<Argumento>
+    'typeof',          # typeof(Tipo)
+    'static',          # Tipo.Metodo(...)
+    'field',           # private readonly Tipo _campo;
+    'declaration',     # Tipo variavel = ...;
+    'using',           # using A.B.Tipo;
+)
+
+# Trechos sem código, compartilhados pelo lexer, pelo minificador e pelo
+# recorte de métodos: literais de string/char (raw, verbatim, interpolados,
+# regulares e char), comentários e diretivas de pré-processador (#region, #if...)
+STRING_LITERAL = (
+    r'\$*"""+.*?"""+'
+    r'|(?:\$@|@\$|@)"(?:[^"]|"")*"'
+    r'|\$?"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+)
+COMMENT = r'//[^\n]*|/\*.*?\*/'
+DIRECTIVE = r'\#[^\n]*'
+# A guarda evita tentar as alternativas fora dos caracteres que as iniciam; use com re.S
+TRIVIA = r'(?=[/#"\'@$])(?:' + COMMENT + '|' + DIRECTIVE + '|' + STRING_LITERAL + ')'
+TRIVIA_PATTERN = re.compile(TRIVIA, re.S)
+
+_GENERIC_ARGS = r'(?:\s*<(?P<{0}>[\w\s,.<>?\[\]]*)>)?'
+_MODIFIERS = r'(?:private|public|protected|internal|static|readonly|const|volatile)'
+
+# Um único padrão percorre o arquivo da esquerda para a direita. Comentários,
+# literais e diretivas (TRIVIA) são consumidos pela primeira alternativa, de
+# modo que nenhuma referência é encontrada dentro deles.
+#
+# As demais alternativas só são tentadas no início de um identificador e o nome
+# do tipo é capturado de forma atômica ((?=(...))(?P=...)), evitando que o
+# motor de regex volte caractere a caractere quando o restante não casa.
+_REFERENCE_PATTERN = re.compile(
+    r'(?P<trivia>' + TRIVIA + r')'
+    r'|(?<![\w.])(?=[^\W\d])(?:'
+    r'(?P<decl>class|struct|interface|record|enum)\s+(?P<decl_name>\w+)(?P<decl_tail>[^{;]*)'
+    r'|new\s+(?P<new>[\w.]+)' + _GENERIC_ARGS.format('new_args') +
+    r'|typeof\s*\(\s*(?P<typeof>[\w.]+)' + _GENERIC_ARGS.format('typeof_args') +
+    r'|using\s+(?:static\s+)?(?:\w+\s*=\s*)?(?P<using>[\w.]+)\s*;'
+    r'|namespace\s+(?P<namespace>[\w.]+)'
+    r'|(?P<modifiers>(?:' + _MODIFIERS + r'\s+)+)?'
+    r'(?=(?P<type>[^\W\d][\w.]*))(?P=type)'
+    r'(?:(?P<call>\s*\()'
+    r'|' + _GENERIC_ARGS.format('type_args') + r'(?P<variable>(?:\s*\[[\s,]*\])*\??\s+@?\w+\s*[=;])'
+    r'|\s*<(?P<generic_args>[\w\s,.<>?\[\]]*)>))',
+    re.S,
+)
+_NAME_PATTERN = re.compile(r'[^\W\d][\w.]*')
+_NOT_TYPES = {
+    'return', 'throw', 'new', 'await', 'yield', 'goto', 'case', 'in', 'is', 'as', 'out', 'ref',
+    'else', 'using', 'namespace', 'typeof', 'nameof', 'sizeof', 'default', 'where', 'var',
+    'this', 'base', 'null', 'true', 'false',
+}
+
+
+@dataclass
+class CSharpReferences:
+    """Resultado da análise de um arquivo C#"""
+    main_class: Optional[str] = None
+    namespace: Optional[str] = None
+    declared_types: List[str] = field(default_factory=list)
+    class_bases: List[str] = field(default_factory=list)
+    references: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def _simple_name(name: str) -> str:
+    """Retorna o último segmento de um nome qualificado (A.B.Tipo -> Tipo)"""
+    return name.rsplit('.', 1)[-1]
+
+
+def _type_arguments(arguments: Optional[str]) -> List[str]:
+    return [_simple_name(name) for name in _NAME_PATTERN.findall(arguments)] if arguments else []
+
+
+def _split_base_list(tail: str) -> List[str]:
+    """Extrai os tipos base de 'X<T> : Base<A>, IInterface where T : class'"""
+    depth = 0
+    start = None
+    for position, char in enumerate(tail):
+        if char == '<':
+            depth += 1
+        elif char == '>':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            start = position + 1
+            break
+    if start is None:
+        return []
+    bases = re.split(r'\bwhere\b', tail[start:], maxsplit=1)[0]
+    # Separa por vírgulas de nível zero, preservando os argumentos genéricos
+    parts, depth, current = [], 0, []
+    for char in bases:
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        depth += (char == '<') - (char == '>')
+        current.append(char)
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def extract_references(content: str) -> CSharpReferences:
+    """
+    Extrai em uma única passada todas as referências de tipo de um arquivo C#.
+
+    As referências são agrupadas pelos tipos definidos em REFERENCE_KINDS,
+    sem repetição e na ordem em que aparecem; nomes qualificados são
+    reduzidos ao nome simples do tipo.
+    """
+    # dict como conjunto ordenado
+    found: Dict[str, Dict[str, None]] = {kind: {} for kind in REFERENCE_KINDS}
+    result = CSharpReferences()
+
+    def emit(kind: str, name: Optional[str], arguments: Optional[str] = None):
+        if name:
+            name = _simple_name(name)
+            found[kind][name] = None
+        if arguments:
+            if name:
+                found['generic'][name] = None
+            for argument in _type_arguments(arguments):
+                found['type_argument'][argument] = None
+
+    for match in _REFERENCE_PATTERN.finditer(content):
+        group = match.lastgroup
+        if group == 'trivia':
+            continue
+        if match.group('decl'):
+            keyword, name = match.group('decl'), match.group('decl_name')
+            result.declared_types.append(name)
+            if keyword == 'class' and result.main_class is None:
+                result.main_class = name
+            for base in _split_base_list(match.group('decl_tail')):
+                base_name = _NAME_PATTERN.match(base)
+                if not base_name:
+                    continue
+                generic_start = base.find('<')
+                emit('inheritance', base_name.group(0), base[generic_start + 1:] if generic_start >= 0 else None)
+                if keyword in ('class', 'record') and _simple_name(base_name.group(0)) not in result.class_bases:
+                    result.class_bases.append(_simple_name(base_name.group(0)))
+        elif match.group('new'):
+            emit('instantiation', match.group('new'), match.group('new_args'))
+        elif match.group('typeof'):
+            emit('typeof', match.group('typeof'), match.group('typeof_args'))
+        elif match.group('using'):
+            if '.' in match.group('using'):
+                emit('using', match.group('using'))
+        elif match.group('namespace'):
+            if result.namespace is None:
+                result.namespace = match.group('namespace')
+        elif match.group('call') is not None:
+            # Tipo.Metodo(...): o tipo é o penúltimo segmento do nome qualificado
+            segments = match.group('type').rsplit('.', 2)
+            if len(segments) > 1 and segments[-2] and segments[-2] not in _NOT_TYPES:
+                emit('static', segments[-2])
+        elif match.group('variable'):
+            if match.group('type') not in _NOT_TYPES:
+                if match.group('type_args'):
+                    emit('generic', match.group('type'), match.group('type_args'))
+                emit('field' if match.group('modifiers') else 'declaration', match.group('type'))
+        elif match.group('generic_args') is not None:
+            if match.group('type') not in _NOT_TYPES:
+                emit('generic', match.group('type'), match.group('generic_args'))
+
+    result.references = {kind: list(names) for kind, names in found.items()}
+    return result
@@ -0,0 +1,80 @@
+import re
+from processing.csharp_lexer import COMMENT, DIRECTIVE, STRING_LITERAL
+
+# Altere ao mudar o resultado da minificação: invalida o cache de pré-processamento
+MINIFIER_VERSION = 2
+
+# Marcadores que ocupam, no texto intermediário, o lugar de um literal
+# (tratado como palavra) ou de uma diretiva de pré-processador (que volta em linha própria)
+_LITERAL_MARK = '\x00'
+_DIRECTIVE_MARK = '\x01'
+
+_USING = r'(?:global\s+)?using\s+(?:static\s+)?[\w.]+(?:\s*=\s*[\w.<>, ]+)?\s*;'
+# Início do arquivo: espaços, comentários, diretivas using (using A.B;
+# using static A.B; using X = A.B; global using A;) e diretivas de
+# pré-processador que não abrem blocos condicionais (#nullable, #pragma...),
+# removidos de uma só vez
+_PROLOGUE = re.compile(
+    r'(?:\s+|' + COMMENT + r'|\#(?!\s*(?:if|elif|else|endif)\b)[^\n]*|' + _USING + r')*',
+    re.S,
+)
+# Diretivas using em linha própria fora do início do arquivo (dentro de
+# namespace ou após um #if), como fazia a remoção por linhas original
+_USING_LINE = re.compile(r'^[ \t]*' + _USING.replace(r'\s', r'[ \t]') + r'[ \t]*$', re.M)
+_COMMENTS_AND_SPACES = re.compile(r'(?:\s+|' + COMMENT + r')*', re.S)
+
+# Literais (mantidos intactos), diretivas de pré-processador e comentários;
+# a guarda evita tentar as alternativas fora dos caracteres que as iniciam
+_STRUCTURE = re.compile(
+    r'(?=[/#"\'@$])(?:'
+    r'(?P<literal>' + STRING_LITERAL + r')'
+    r'|(?P<directive>' + DIRECTIVE + r')'
+    r'|(?P<comment>' + COMMENT + r'))',
+    re.S,
+)
+
+# Espaço junto a pontuação que nunca forma outro token com o vizinho. Começa
+# por um espaço literal para que o motor salte direto entre os candidatos.
+_REMOVABLE_SPACE = re.compile(r' (?:(?=[;,{}()\[\]=\x01])|(?<=[;,{}()\[\]=\x01] ))')
+_MARKS = re.compile('[' + _LITERAL_MARK + _DIRECTIVE_MARK + ']')
+
+
+def minify_csharp(code: str, remove_usings: bool = True) -> str:
+    """
+    Minifica código C#: remove comentários, diretivas using e espaços
+    desnecessários, mantendo literais de string/char intactos e as diretivas
+    de pré-processador (#if, #region...) em linhas próprias.
+
+    As diretivas using são removidas do início do arquivo e de qualquer linha
+    que contenha apenas uma delas. Uma única varredura
+    identifica literais, comentários e diretivas; a redução de espaços no
+    restante do código é feita por operações lineares em C (str.split e um
+    padrão com substituição fixa), sem chamadas Python por espaço.
+    """
+    if _LITERAL_MARK in code or _DIRECTIVE_MARK in code:
+        # Os marcadores não podem aparecer no código original
+        code = code.replace(_LITERAL_MARK, ' ').replace(_DIRECTIVE_MARK, ' ')
+
+    kept = []
+
+    def stash(match):
+        kind = match.lastgroup
+        if kind == 'literal':
+            kept.append(match.group())
+            return _LITERAL_MARK
+        if kind == 'directive':
+            kept.append('\n' + match.group().rstrip() + '\n')
+            return _DIRECTIVE_MARK
+        # Comentários viram espaço: a/**/b não vira ab
+        return ' '
+
+    prologue = (_PROLOGUE if remove_usings else _COMMENTS_AND_SPACES).match(code)
+    code = _STRUCTURE.sub(stash, code[prologue.end():])
+    if remove_usings and 'using' in code:
+        # Depois da varredura: literais e comentários já não contêm 'using'
+        code = _USING_LINE.sub('', code)
+    code = _REMOVABLE_SPACE.sub('', ' '.join(code.split()))
+    if kept:
+        parts = iter(kept)
+        code = _MARKS.sub(lambda match: next(parts), code)
+    return code.strip()
@@ -0,0 +1,302 @@
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from processing.symbol_index import SymbolIndex, index_key
+
+# Tipos de aresta; a posição na tupla é o código gravado em `kinds`
+EDGE_KINDS = ('instance', 'static', 'inheritance', 'interface', 'similarity')
+# Arestas seguidas por padrão na árvore de dependências (as mesmas de class_processor_v2)
+TRAVERSAL_KINDS = ('instance', 'static', 'inheritance')
+
+_KIND_CODES = {kind: code for code, kind in enumerate(EDGE_KINDS)}
+
+
+def kinds_mask(kinds: Iterable[str]) -> int:
+    """Converte uma lista de tipos de aresta na máscara aceita pelas consultas"""
+    mask = 0
+    for kind in kinds:
+        mask |= 1 << _KIND_CODES[kind]
+    return mask
+
+
+@dataclass
+class Condensation:
+    """
+    Grafo de componentes fortemente conexas (DAG) de um DependencyGraph.
+
+    As componentes estão em ordem topológica das folhas para a raiz: toda
+    componente aparece depois daquelas de que depende. Uma componente com mais
+    de uma classe é um ciclo de dependências mútuas.
+    """
+    components: List[List[int]]
+    component_of: Dict[int, int]
+    successors: List[List[int]]
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def is_cycle(self, component: int) -> bool:
+        # O grafo não guarda arestas de um nó para ele mesmo
+        return len(self.components[component]) > 1
+
+    def levels(self) -> List[List[int]]:
+        """
+        Agrupa as componentes em níveis, das folhas para a raiz: cada nível
+        depende apenas dos anteriores, então as componentes de um mesmo nível
+        podem ser processadas em paralelo.
+        """
+        depths = []
+        for successors in self.successors:
+            # Sucessores têm índice menor: já foram calculados
+            depths.append(1 + max((depths[successor] for successor in successors), default=-1))
+        levels = [[] for _ in range(max(depths, default=-1) + 1)]
+        for component, depth in enumerate(depths):
+            levels[depth].append(component)
+        return levels
+
+
+class DependencyGraph:
+    """
+    Grafo de dependências entre as classes do projeto, montado uma única vez.
+
+    Cada classe é um nó com id inteiro; as arestas ficam em formato CSR: as
+    arestas do nó `n` são `targets[offsets[n]:offsets[n + 1]]`, com o tipo de
+    cada uma em `kinds`. As consultas são buscas em largura sobre esses arrays,
+    sem ler arquivos nem alterar estado.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        paths: List[str],
+        references: List[Dict[str, List[str]]],
+        offsets: array,
+        targets: array,
+        kinds: array,
+    ):
+        self.names = names
+        self.paths = paths
+        self.references = references
+        self.offsets = offsets
+        self.targets = targets
+        self.kinds = kinds
+        self.node_ids = {name: node for node, name in enumerate(names)}
+        self._path_ids = {index_key(path): node for node, path in enumerate(paths)}
+
+    @classmethod
+    def from_symbol_index(
+        cls,
+        symbol_index: SymbolIndex,
+        class_files: Optional[Dict[str, str]] = None,
+        similarity_table: Optional[Dict[str, List[Tuple[str, float]]]] = None,
+    ) -> 'DependencyGraph':
+        """
+        Monta o grafo a partir do índice de símbolos.
+
+        Args:
+            symbol_index: Índice com as referências de cada arquivo.
+            class_files: Mapa classe -> arquivo (por padrão, o do índice).
+            similarity_table: Tabela de classes similares (class_processor.build_similarity_table),
+                usada para as arestas do tipo 'similarity'.
+        """
+        if class_files is None:
+            class_files = symbol_index.class_files()
+        names = list(class_files)
+        paths = [class_files[name] for name in names]
+        node_ids = {name: node for node, name in enumerate(names)}
+
+        all_references = symbol_index.all_references()
+        implementations: Dict[str, List[int]] = {}
+        for base_type, class_name, path in symbol_index.all_implementations():
+            # Mesma regra de find_interface_implementations: só vale o arquivo mapeado para a classe
+            if class_files.get(class_name) == path:
+                implementations.setdefault(base_type, []).append(node_ids[class_name])
+
+        references = []
+        offsets = array('l', [0])
+        targets = array('l')
+        kinds = array('b')
+        for node, name in enumerate(names):
+            node_references = all_references.get(index_key(paths[node]), {})
+            references.append(node_references)
+            seen = {node}
+
+            def add(target: Optional[int], kind: str):
+                if target is not None and target not in seen:
+                    seen.add(target)
+                    targets.append(target)
+                    kinds.append(_KIND_CODES[kind])
+
+            for kind in TRAVERSAL_KINDS:
+                for dependency in sorted(node_references.get(kind, ())):
+                    add(node_ids.get(dependency), kind)
+            for interface in sorted(node_references.get('interfaces', ())):
+                for target in implementations.get(interface, ()):
+                    add(target, 'interface')
+            if similarity_table:
+                for similar_name, _ in similarity_table.get(name, ()):
+                    add(node_ids.get(similar_name), 'similarity')
+            offsets.append(len(targets))
+
+        return cls(names, paths, references, offsets, targets, kinds)
+
+    @classmethod
+    def from_adjacency(cls, names: List[str], paths: List[str], adjacency: List[Iterable[int]]) -> 'DependencyGraph':
+        """
+        Monta o grafo a partir de listas de adjacência (nó -> nós de que ele
+        depende), com arestas do tipo 'instance'; usado para grafos pequenos,
+        como o dos arquivos de um relatório.
+        """
+        offsets = array('l', [0])
+        targets = array('l')
+        for node, dependencies in enumerate(adjacency):
+            targets.extend(target for target in dict.fromkeys(dependencies) if target != node)
+            offsets.append(len(targets))
+        kinds = array('b', [_KIND_CODES['instance']] * len(targets))
+        return cls(names, paths, [{} for _ in names], offsets, targets, kinds)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def node_for_path(self, path: str) -> Optional[int]:
+        return self._path_ids.get(index_key(path))
+
+    def edges(self, node: int, kinds: Sequence[str] = EDGE_KINDS) -> Iterator[Tuple[int, str]]:
+        """Percorre as arestas de saída do nó, filtradas por tipo"""
+        mask = kinds_mask(kinds)
+        for position in range(self.offsets[node], self.offsets[node + 1]):
+            code = self.kinds[position]
+            if mask >> code & 1:
+                yield self.targets[position], EDGE_KINDS[code]
+
+    def bfs(self, start: int, max_depth: int, kinds: Sequence[str] = TRAVERSAL_KINDS) -> List[Tuple[int, int]]:
+        """
+        Retorna (nó, profundidade) dos nós alcançáveis a partir de `start` com
+        profundidade menor que `max_depth`, em ordem de busca em largura.
+        """
+        if max_depth <= 0:
+            return []
+        mask = kinds_mask(kinds)
+        offsets, targets, edge_kinds = self.offsets, self.targets, self.kinds
+        depths = {start: 0}
+        order = [(start, 0)]
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            depth = depths[node] + 1
+            if depth >= max_depth:
+                continue
+            for position in range(offsets[node], offsets[node + 1]):
+                target = targets[position]
+                if target not in depths and mask >> edge_kinds[position] & 1:
+                    depths[target] = depth
+                    order.append((target, depth))
+                    queue.append(target)
+        return order
+
+    def strongly_connected_components(
+        self,
+        nodes: Optional[Iterable[int]] = None,
+        kinds: Sequence[str] = TRAVERSAL_KINDS,
+    ) -> List[List[int]]:
+        """
+        Componentes fortemente conexas (algoritmo de Tarjan, com pilha
+        explícita), restritas a `nodes` se informado. As componentes saem em
+        ordem topológica das folhas para a raiz.
+        """
+        mask = kinds_mask(kinds)
+        offsets, targets, edge_kinds = self.offsets, self.targets, self.kinds
+        roots = range(len(self.names)) if nodes is None else list(dict.fromkeys(nodes))
+        scope = None if nodes is None else set(roots)
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack: Set[int] = set()
+        components = []
+
+        for root in roots:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # Cada item: (nó, próxima aresta a examinar)
+            work = [(root, offsets[root])]
+            while work:
+                node, position = work[-1]
+                end = offsets[node + 1]
+                descended = False
+                while position < end:
+                    target = targets[position]
+                    code = edge_kinds[position]
+                    position += 1
+                    if not mask >> code & 1 or (scope is not None and target not in scope):
+                        continue
+                    if target not in index:
+                        work[-1] = (node, position)
+                        index[target] = lowlink[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, offsets[target]))
+                        descended = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+        return components
+
+    def condense(self, nodes: Optional[Iterable[int]] = None, kinds: Sequence[str] = TRAVERSAL_KINDS) -> Condensation:
+        """Condensa o grafo (ou o subgrafo de `nodes`) no DAG de componentes fortemente conexas"""
+        components = self.strongly_connected_components(nodes, kinds)
+        component_of = {node: component for component, members in enumerate(components) for node in members}
+        mask = kinds_mask(kinds)
+        successors = []
+        for component, members in enumerate(components):
+            dependencies = set()
+            for node in members:
+                for position in range(self.offsets[node], self.offsets[node + 1]):
+                    if mask >> self.kinds[position] & 1:
+                        target = component_of.get(self.targets[position])
+                        if target is not None and target != component:
+                            dependencies.add(target)
+            successors.append(sorted(dependencies))
+        return Condensation(components, component_of, successors)
+
+    def documentation_order(self, condensation: Condensation) -> List[List[Dict]]:
+        """
+        Níveis de documentação de uma condensação, no formato dos relatórios:
+        cada unidade é uma componente, marcada com "cycle" quando é um ciclo.
+        """
+        return [
+            [
+                {
+                    "cycle": condensation.is_cycle(component),
+                    "classes": [
+                        {"class_name": self.names[node], "file_path": self.paths[node]}
+                        for node in condensation.components[component]
+                    ],
+                }
+                for component in level
+            ]
+            for level in condensation.levels()
+        ]
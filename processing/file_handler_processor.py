@@ -1,10 +1,176 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from processing.csharp_minifier import minify_csharp
+from processing.parallel import PARALLEL_THRESHOLD, pool_chunksize, resolve_workers
+from processing.preprocess_cache import PreprocessCache, preprocess_cache_key
+from processing.source_cache import read_source
+
+_USING_LINE_PATTERN = re.compile(r"^using\s+[a-zA-Z0-9_.]+;\s*$", re.MULTILINE)
+_BLANK_LINE_PATTERN = re.compile(r"^\s*\n", re.MULTILINE)
+_HASH_COMMENT_PATTERN = re.compile(r'#.*')
+_LINE_COMMENT_PATTERN = re.compile(r'//.*')
+_BLOCK_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+_FUNCTION_PATTERN = re.compile(r'def\s+(\w+)\s*\(')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """Etapas do pré-processamento aplicadas ao código antes de montar o prompt"""
+    remove_usings: bool = True
+    remove_comments: bool = True
+    remove_dead_code: bool = True
+    minify: bool = True
+
+
+DEFAULT_OPTIONS = PreprocessOptions()
+
+
+def remove_using_lines(code: str) -> str:
+    """Remove as linhas `using ...;` e as linhas em branco que sobrarem."""
+    cleaned_code = _USING_LINE_PATTERN.sub("", code)
+    return _BLANK_LINE_PATTERN.sub("", cleaned_code)
+
+
+def remove_comments(code: str) -> str:
+    """Remove comentários de linha (// ou #) e de bloco (/* */)."""
+    code = _HASH_COMMENT_PATTERN.sub('', code)
+    code = _LINE_COMMENT_PATTERN.sub('', code)
+    return _BLOCK_COMMENT_PATTERN.sub('', code)
+
+
+def remove_dead_code(code: str) -> str:
+    """Remove funções ou métodos não utilizados (código morto)."""
+    # Encontra todas as funções/métodos definidos
+    functions = _FUNCTION_PATTERN.findall(code)
+    used_functions = {func for func in functions if re.search(rf'\b{func}\s*\(', code)}
+
+    # Remove funções não utilizadas
+    for func in functions:
+        if func not in used_functions:
+            code = re.sub(rf'def\s+{func}\s*\(.*?\):.*?(?=def|\Z)', '', code, flags=re.DOTALL)
+    return code
+
+
+def minify(code: str) -> str:
+    """Remove quebras de linha e espaços extras, deixando o código em uma única linha."""
+    return _WHITESPACE_PATTERN.sub(' ', code).strip()
+
+
+def process(code: str, options: PreprocessOptions = DEFAULT_OPTIONS) -> str:
+    """
+    Pré-processa o código sem guardar estado: pode ser chamada de várias
+    threads ou processos ao mesmo tempo.
+
+    Com minificação e remoção de comentários (o padrão), usa o minificador
+    C# de uma passada, que preserva literais e diretivas de pré-processador;
+    `remove_dead_code` só reconhece funções Python (`def`) e não se aplica a ele.
+    """
+    if options.minify and options.remove_comments:
+        return minify_csharp(code, options.remove_usings)
+    if options.remove_usings:
+        code = remove_using_lines(code)
+    if options.remove_comments:
+        code = remove_comments(code)
+    if options.remove_dead_code:
+        code = remove_dead_code(code)
+    if options.minify:
+        code = minify(code)
+    return code
+
+
+def _read_task_source(file_path: str) -> Optional[str]:
+    if not file_path or not os.path.exists(file_path):
+        print(f"Arquivo '{file_path}' não encontrado. Pulando...")
+        return None
+    try:
+        return read_source(file_path)
+    except OSError as e:
+        print(f"Erro ao processar o arquivo '{os.path.basename(file_path)}': {e}")
+        return None
+
+
+def _process_file_task(task: Tuple[str, PreprocessOptions, Optional[str]]) -> Optional[str]:
+    """Pré-processa um arquivo (lendo-o, se o conteúdo não vier na tarefa) dentro de um worker do pool de processos"""
+    file_path, options, source = task
+    if source is None:
+        source = _read_task_source(file_path)
+    if source is None:
+        return None
+    try:
+        return process(source, options)
+    except Exception as e:
+        print(f"Erro ao processar o arquivo '{os.path.basename(file_path)}': {e}")
+        return None
+
+
+def _collect(paths, contents, results, progress):
+    for path, content in zip(paths, contents):
+        results[path] = content
+        if progress:
+            progress(path, content)
+
+
+def process_files(
+    file_paths: List[str],
+    options: PreprocessOptions = DEFAULT_OPTIONS,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[str, Optional[str]], None]] = None,
+    cache: Optional[PreprocessCache] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Lê e pré-processa vários arquivos em um pool de processos.
+
+    Cada caminho é processado uma única vez, mesmo se repetido; arquivos
+    ausentes ou com erro resultam em None. `progress(path, conteúdo)` é
+    chamada, na ordem de entrada, à medida que os resultados chegam.
+
+    Com `cache` (PreprocessCache), arquivos cujo conteúdo já foi
+    pré-processado com as mesmas opções não são processados de novo; apenas
+    os demais vão para o pool, e os novos resultados são gravados no cache.
+    """
+    unique_paths = list(dict.fromkeys(file_paths))
+    results = {}
+    sources = {}
+    keys = {}
+    if cache is not None:
+        sources = {path: _read_task_source(path) for path in unique_paths}
+        keys = {path: preprocess_cache_key(source, options) for path, source in sources.items() if source is not None}
+        cached = cache.get_many(keys.values())
+        for path in unique_paths:
+            if path not in keys or keys[path] in cached:
+                results[path] = cached.get(keys.get(path))
+                if progress:
+                    progress(path, results[path])
+
+    pending = [path for path in unique_paths if path not in results]
+    # O conteúdo já lido segue na tarefa: o resultado corresponde à chave calculada
+    tasks = [(path, options, sources.get(path)) for path in pending]
+    max_workers = resolve_workers(max_workers)
+    if max_workers <= 1 or len(tasks) < PARALLEL_THRESHOLD:
+        _collect(pending, map(_process_file_task, tasks), results, progress)
+    else:
+        chunksize = pool_chunksize(len(tasks), max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            _collect(pending, executor.map(_process_file_task, tasks, chunksize=chunksize), results, progress)
+
+    if cache is not None:
+        cache.put_many((keys[path], results[path]) for path in pending if path in keys and results[path] is not None)
+    return {path: results[path] for path in unique_paths}
+
 
 class FileHandlerProcessor:
-    def __init__(self):
+    def __init__(self, options: PreprocessOptions = DEFAULT_OPTIONS):
         """
         Inicializa a classe com o código a ser processado.
+
+        Mantida para compatibilidade; o processamento é feito pelas funções
+        `process` e `process_files`, que não guardam estado.
         """
+        self.options = options
         self.code = None
 
     def initialize(self, code: str):
@@ -14,52 +180,26 @@ class FileHandlerProcessor:
         """
         Remove comentários de uma string de código.
         """
-        # Remove comentários de linha (// ou #)
-        self.code = re.sub(r'#.*', '', self.code)
-        self.code = re.sub(r'//.*', '', self.code)
-        # Remove comentários de bloco (/* */)
-        self.code = re.sub(r'/\*.*?\*/', '', self.code, flags=re.DOTALL)
+        self.code = remove_comments(self.code)
 
     def remove_dead_code(self):
         """
         Remove funções ou métodos não utilizados (código morto).
         """
-        # Encontra todas as funções/métodos definidos
-        functions = re.findall(r'def\s+(\w+)\s*\(', self.code)
-        used_functions = set()
-
-        # Verifica quais funções são chamadas no código
-        for func in functions:
-            if re.search(rf'\b{func}\s*\(', self.code):
-                used_functions.add(func)
-
-        # Remove funções não utilizadas
-        for func in functions:
-            if func not in used_functions:
-                self.code = re.sub(rf'def\s+{func}\s*\(.*?\):.*?(?=def|\Z)', '', self.code, flags=re.DOTALL)
+        self.code = remove_dead_code(self.code)
 
     def minify_code(self):
         """
         Minifica o código, removendo espaços desnecessários e colocando tudo em uma única linha.
         """
-        # Remove quebras de linha e espaços extras
-        self.code = re.sub(r'\s+', ' ', self.code).strip()
+        self.code = minify(self.code)
 
     def remove_using_lines_code(self) -> str:
-        # Define o padrão para capturar linhas que começam com "using" e terminam com ";"
-        pattern = r"^using\s+[a-zA-Z0-9_.]+;\s*$"
-        # Usa re.sub para substituir as linhas que correspondem ao padrão por uma string vazia
-        cleaned_code = re.sub(pattern, "", self.code, flags=re.MULTILINE)
-        # Remove linhas em branco extras
-        cleaned_code = re.sub(r"^\s*\n", "", cleaned_code, flags=re.MULTILINE)
-        self.code = cleaned_code
+        self.code = remove_using_lines(self.code)
 
     def process(self):
         """
         Processa o código para remover comentários, código morto e minificá-lo.
         """
-        self.remove_using_lines_code()
-        self.remove_comments()
-        self.remove_dead_code()
-        self.minify_code()
+        self.code = process(self.code, self.options)
         return self.code
@@ -1,9 +1,10 @@
 import os
 import json
 import streamlit as st
+from processing.symbol_index import SymbolIndex, build_symbol_index, update_symbol_index, walk_cs_files
 
 class CSFileIndexer:
-    def __init__(self, base_path=None, save_full_path=True, ignore_patterns=None):
+    def __init__(self, base_path=None, save_full_path=True, ignore_patterns=None, max_workers=None):
         """
         Inicializa o indexador de arquivos .cs.
 
@@ -11,11 +12,14 @@ class CSFileIndexer:
             base_path (str): Caminho base do projeto. Se None, será solicitado ao usuário.
             save_full_path (bool): Se True, salva o caminho completo dos arquivos. Caso contrário, salva apenas os nomes.
             ignore_patterns (list): Lista de padrões de nomes de arquivos ou pastas a serem ignorados.
+            max_workers (int): Número de processos usados na extração de símbolos. Se None, usa todos os núcleos.
         """
         self.base_path = base_path
         self.save_full_path = save_full_path
         self.ignore_patterns = ignore_patterns or ["test", "tests"]
+        self.max_workers = max_workers
         self.cs_files = []
+        self.cs_paths = []
 
     def should_ignore(self, path):
         """
@@ -44,17 +48,13 @@ class CSFileIndexer:
             return []
 
         cs_files = []
-        for root, dirs, files in os.walk(self.base_path):
-            # Filtra pastas a serem ignoradas
-            dirs[:] = [d for d in dirs if not self.should_ignore(d)]
-            
-            for file in files:
-                if file.endswith(".cs") and not self.should_ignore(file):
-                    file_path = os.path.join(root, file)
-                    cs_files.append({
-                        "file_name": file,
-                        "path": file_path if self.save_full_path else file
-                    })
+        self.cs_paths = []
+        for file, file_path in walk_cs_files(self.base_path, self.should_ignore):
+            self.cs_paths.append((file, file_path))
+            cs_files.append({
+                "file_name": file,
+                "path": file_path if self.save_full_path else file
+            })
         self.cs_files = cs_files
         return cs_files
 
@@ -74,4 +74,31 @@ class CSFileIndexer:
                 json.dump(self.cs_files, json_file, indent=4, ensure_ascii=False)
             st.success(f"Índice salvo em: {output_path}")
         except Exception as e:
-            st.error(f"Erro ao salvar o arquivo JSON: {e}")
\ No newline at end of file
+            st.error(f"Erro ao salvar o arquivo JSON: {e}")
+
+    def save_symbol_index(self, db_path, incremental=False):
+        """
+        Extrai os símbolos dos arquivos coletados e os salva no índice SQLite.
+
+        Args:
+            db_path (str): Caminho do banco de dados do índice de símbolos.
+            incremental (bool): Se True, analisa apenas os arquivos adicionados ou alterados
+                desde a última indexação e remove os excluídos.
+
+        Returns:
+            SymbolIndex: Índice de símbolos atualizado.
+        """
+        symbol_index = SymbolIndex(db_path)
+        try:
+            if incremental and not symbol_index.is_empty():
+                summary = update_symbol_index(symbol_index, self.cs_paths, self.max_workers)
+                st.success(
+                    f"Índice de símbolos atualizado: {len(summary['added'])} adicionado(s), "
+                    f"{len(summary['changed'])} alterado(s), {len(summary['removed'])} removido(s)."
+                )
+            else:
+                total = build_symbol_index(symbol_index, self.cs_paths, self.max_workers)
+                st.success(f"Índice de símbolos salvo em: {db_path} ({total} arquivos)")
+        except Exception as e:
+            st.error(f"Erro ao salvar o índice de símbolos: {e}")
+        return symbol_index
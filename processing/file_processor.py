@@ -1,5 +1,13 @@
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from processing.file_handler_processor import DEFAULT_OPTIONS
+from processing.method_slicer import slice_methods
+from processing.preprocess_cache import get_preprocess_cache
+from processing.preprocess_scheduler import PreprocessScheduler
+from processing.source_cache import read_source, source_cache
+from processing.prompt_planner import DEFAULT_MAX_PROMPT_CHARS, PromptPlanner
+from stackspot_ai.async_quick_command_manager import AsyncQuickCommandManager
+from stackspot_ai.prompts_manager import PromptsManager
+from stackspot_ai.result_cache import result_cache_key
 
 class FileProcessor:
     def __init__(
@@ -12,8 +20,28 @@ class FileProcessor:
         prompts_manager,
         max_file_workers=4,
         use_parallel=False,
+        result_cache=None,
+        model_tag="",
+        use_result_cache=True,
+        max_prompt_chars=DEFAULT_MAX_PROMPT_CHARS,
+        async_quick_command_manager=None,
+        preprocess_cache=None,
+        use_preprocess_cache=True,
+        use_method_slicing=True,
     ):
-        """Inicializa o processador de arquivos baseado em JSON."""
+        """
+        Inicializa o processador de arquivos baseado em JSON.
+
+        Com `result_cache` (ResultCache), respostas para o mesmo quick command,
+        prompt e `model_tag` são reaproveitadas sem chamar a API;
+        `use_result_cache=False` ignora o cache na leitura, mas grava a nova resposta.
+        Prompts acima de `max_prompt_chars` são divididos em partes executadas em
+        paralelo (pelo `async_quick_command_manager`, criado sob demanda) e unificadas ao final.
+        O código pré-processado fica em `preprocess_cache` (PreprocessCache); sem ele, usa o
+        cache compartilhado de get_preprocess_cache. `use_preprocess_cache=False` desativa o cache.
+        Com `use_method_slicing`, classes com `methods` informados entram no prompt apenas com
+        esses métodos, os métodos e campos que eles usam e os construtores.
+        """
         self.api_url = api_url
         self.execute_slug = execute_slug
         self.token_manager = token_manager
@@ -22,135 +50,272 @@ class FileProcessor:
         self.prompts_manager = prompts_manager
         self.max_file_workers = max_file_workers
         self.use_parallel = use_parallel
+        self.result_cache = result_cache
+        self.model_tag = model_tag
+        self.use_result_cache = use_result_cache
+        self.max_prompt_chars = max_prompt_chars
+        self.async_quick_command_manager = async_quick_command_manager
+        self.preprocess_cache = preprocess_cache
+        self.use_preprocess_cache = use_preprocess_cache
+        self.use_method_slicing = use_method_slicing
         self.metadata = None
         self.main_class = None
         self.main_class_code = None
         self.execution_mode = None
         self.documentation_type = None
         self.dependencies = []
+        self.documentation_order = []
         self.processed_files = []
+        self.scheduler = PreprocessScheduler()
 
     def process_json(self, json_data):
         """Processa os arquivos com base no JSON fornecido."""
         try:
-            print(f"json: {json_data}")
-            # Extraindo os objetos principais
-            self.metadata = json_data.get("metadata", {})
-            self.main_class = json_data.get("main_class", {})
-            self.dependencies = json_data.get("dependencies", [])
-            self.execution_mode = json_data.get("execution_mode", None)
-            self.documentation_type = json_data.get("documentation_type", None)
-            print(f"tipo documento {self.documentation_type}")
-    
-            # Processa o arquivo principal
-            self.main_class_code = self._read_file(self.main_class.get("path", ""))
-            self.file_handler_processor.initialize(self.main_class_code)
-            self.main_class_code = self.file_handler_processor.process()
-    
-            # Inicializa variáveis para armazenar os conteúdos processados
-            self.dependency_contents = {}
-            self.subdependency_contents = {}
-    
-            # Processa as dependências
-            self._process_dependencies(self.dependencies)
-    
+            self._load_json(json_data)
+
             # Chamada extra para StackSpot AI após a leitura completa do JSON
             self._call_stackspot_ai()
         except Exception as e:
             print(f"Erro durante o processamento do JSON: {e}")
-    
-    def _process_dependencies(self, dependencies):
-        """Processa as dependências recursivamente."""
-        if not dependencies:
-            return
-    
-        if self.use_parallel:
-            with ThreadPoolExecutor(max_workers=self.max_file_workers) as executor:
-                futures = [
-                    executor.submit(self._process_dependency, dependency)
-                    for dependency in dependencies
-                ]
-                for future in as_completed(futures):
-                    future.result()
-        else:
-            for dependency in dependencies:
-                self._process_dependency(dependency)
-    
-    def _process_dependency(self, dependency):
-        """Processa uma única dependência, incluindo subdependências."""
-        try:
-            # Processa o arquivo da dependência
-            dependency_path = dependency.get("path", "")
-            if dependency_path:
-                processed_content = self._process_file(dependency_path)
-                self.dependency_contents[dependency_path] = processed_content
-    
-            # Processa as subdependências, se existirem
-            subdependencies = dependency.get("subdependencies", [])
-            if subdependencies:
-                print(f"Processando subdependências de {dependency_path}...")
-                for subdependency in subdependencies:
-                    subdependency_path = subdependency.get("path", "")
-                    if subdependency_path:
-                        subprocessed_content = self._process_file(subdependency_path)
-                        self.subdependency_contents[subdependency_path] = subprocessed_content
-        except Exception as e:
-            print(f"Erro ao processar dependência '{dependency.get('path', '')}': {e}")
-    
-    def _process_file(self, file_path):
-        """Processa um único arquivo."""
-        if not file_path or not os.path.exists(file_path):
-            print(f"Arquivo '{file_path}' não encontrado. Pulando...")
-            return None
-    
-        file_name = os.path.basename(file_path)
-        try:
-            file_data = self._read_file(file_path)
-            self.file_handler_processor.initialize(file_data)
-            processed_data = self.file_handler_processor.process()
-            return processed_data
-        except Exception as e:
-            print(f"Erro ao processar o arquivo '{file_name}': {e}")
+
+    def process_many_json(self, json_list, async_quick_command_manager=None):
+        """
+        Documenta vários domínios de uma vez.
+
+        Os arquivos de cada JSON são lidos e os prompts montados em sequência;
+        as execuções na StackSpot AI (todas as partes de todos os domínios) são
+        enviadas e aguardadas de forma concorrente pelo AsyncQuickCommandManager.
+        Domínios divididos pelo PromptPlanner recebem uma execução final que
+        unifica as partes, e cada resposta é salva no Markdown do seu domínio.
+
+        Retorna uma resposta por JSON, na ordem de `json_list`; um JSON que não
+        pôde ser lido ou executado tem a exceção na sua posição.
+        """
+        async_quick_command_manager = async_quick_command_manager or self._get_async_quick_command_manager()
+        jobs = []
+        for json_data in json_list:
+            try:
+                self._load_json(json_data)
+                self._resolve_execute_slug()
+                jobs.append((self.execute_slug, self._plan_prompts(), self.metadata, self.documentation_type))
+            except Exception as e:
+                print(f"Erro durante o processamento do JSON: {e}")
+                jobs.append(e)
+        loaded = [index for index, job in enumerate(jobs) if not isinstance(job, Exception)]
+
+        responses = iter(self._execute_many(
+            [(jobs[index][0], prompt) for index in loaded for prompt in jobs[index][1].prompts],
+            async_quick_command_manager,
+        ))
+        partials = {index: [next(responses) for _ in jobs[index][1].prompts] for index in loaded}
+
+        # Etapa de unificação, apenas para os domínios divididos cujas partes foram concluídas
+        merge_indexes = [
+            index for index in loaded
+            if jobs[index][1].chunked and not any(isinstance(part, Exception) for part in partials[index])
+        ]
+        merged = self._execute_many(
+            [(jobs[index][0], self._build_merge_prompt(partials[index], jobs[index][2])) for index in merge_indexes],
+            async_quick_command_manager,
+        )
+        merged = dict(zip(merge_indexes, merged))
+
+        results = []
+        for index, job in enumerate(jobs):
+            if isinstance(job, Exception):
+                results.append(job)
+                continue
+            _, _, metadata, documentation_type = job
+            parts = partials[index]
+            errors = [part for part in parts if isinstance(part, Exception)]
+            response = errors[0] if errors else merged.get(index, parts[0])
+            results.append(response)
+            if isinstance(response, Exception):
+                print(f"Erro ao realizar a chamada para StackSpot AI ({metadata.get('name', '')}): {response}")
+                continue
+            self._save_to_markdown(response.get("result", ""), metadata, documentation_type)
+        return results
+
+    def _load_json(self, json_data):
+        """Lê o JSON e processa o arquivo principal e as dependências."""
+        print(f"json: {json_data}")
+        # Extraindo os objetos principais
+        self.metadata = json_data.get("metadata", {})
+        self.main_class = json_data.get("main_class", {})
+        self.dependencies = json_data.get("dependencies", [])
+        self.documentation_order = json_data.get("documentation_order", [])
+        self.execution_mode = json_data.get("execution_mode", None)
+        self.documentation_type = json_data.get("documentation_type", None)
+        print(f"tipo documento {self.documentation_type}")
+
+        # Processa o arquivo principal e as dependências, cada arquivo distinto uma única vez
+        main_class_path = self.main_class.get("path", "")
+        self.scheduler = self._process_dependencies(main_class_path, self.dependencies)
+        main_class_code = self.scheduler.content(main_class_path)
+        if main_class_code is None:
+            raise FileNotFoundError(f"Arquivo principal '{main_class_path}' não encontrado ou não processado.")
+        self.main_class_code = self._class_code(main_class_path, self.main_class.get("methods", []))
+        if len(self.main_class_code) < len(main_class_code):
+            print(f"Recorte de métodos da classe principal: {len(main_class_code)} -> {len(self.main_class_code)} caracteres.")
+
+        print(f"Cache de código fonte: {source_cache.stats()}")
+
+    def _process_dependencies(self, main_class_path, dependencies):
+        """
+        Pré-processa a classe principal, as dependências e as subdependências;
+        arquivos repetidos na hierarquia são processados uma única vez e, com
+        use_parallel, distribuídos em um pool de processos. Arquivos sem
+        alteração desde a última execução vêm do cache de pré-processamento.
+        """
+        scheduler = PreprocessScheduler(
+            self._preprocess_options(),
+            max_workers=None if self.use_parallel else 1,
+            cache=self._get_preprocess_cache(),
+        )
+        scheduler.add(main_class_path)
+        scheduler.add_dependencies(dependencies)
+        progress = scheduler.run()
+        print(f"Pré-processamento: {progress['done']} de {progress['total']} arquivo(s) distintos, {progress['failed']} com falha.")
+        return scheduler
+
+    def _get_preprocess_cache(self):
+        """Cache de pré-processamento em uso, aberto na primeira execução"""
+        if not self.use_preprocess_cache:
             return None
-    
+        if self.preprocess_cache is None:
+            self.preprocess_cache = get_preprocess_cache()
+        return self.preprocess_cache
+
+    def _class_code(self, path, methods, default=None):
+        """
+        Código pré-processado de uma classe, recortado nos métodos pedidos; sem
+        métodos informados (ou se nenhum for encontrado), retorna a classe inteira.
+        """
+        code = self.scheduler.content(path, default)
+        if not self.use_method_slicing or code is None or code is default:
+            return code
+        sliced = slice_methods(code, methods)
+        return code if sliced is None else sliced
+
+    def _preprocess_options(self):
+        """Opções de pré-processamento definidas no FileHandlerProcessor"""
+        return getattr(self.file_handler_processor, "options", DEFAULT_OPTIONS)
+
     def _read_file(self, file_path):
-        """Lê o conteúdo de um arquivo, tentando diferentes codificações."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
-        except UnicodeDecodeError:
-            print(f"Erro ao decodificar '{file_path}' como UTF-8. Tentando com 'latin-1'...")
-            with open(file_path, "r", encoding="latin-1") as file:
-                return file.read()
+        """Lê o conteúdo de um arquivo através do cache compartilhado de código fonte."""
+        return read_source(file_path)
 
     def _call_stackspot_ai(self):
         """Realiza uma chamada extra para StackSpot AI após a leitura completa do JSON."""
         try:
-            # Ajusta o execute_slug com base no tipo de documentação
-            if self.documentation_type == "Negócio":
-                self.execute_slug = "rqc-domain-documentation"
-            elif self.documentation_type == "Técnica":
-                self.execute_slug = "rqc-tech-documentation"
+            self._resolve_execute_slug()
+
+            if self.documentation_order and self.dependencies:
+                # Ordem de documentação do relatório: unidades de cada nível em paralelo
+                response = self._execute_levels(self._documentation_levels())
+                self._save_to_markdown(response.get("result", ""))
+                return
 
             # Construindo o prompt com os dados extraídos
-            prompt = self._build_prompt()
-            print(f"prompt: {prompt}")
+            plan = self._plan_prompts()
+            if plan.chunked:
+                # Partes executadas em paralelo e unificadas em uma execução final
+                parts = self._execute_many(
+                    [(self.execute_slug, prompt) for prompt in plan.prompts],
+                    self._get_async_quick_command_manager(),
+                )
+                for part in parts:
+                    if isinstance(part, Exception):
+                        raise part
+                response = self._execute(self.execute_slug, self._build_merge_prompt(parts, self.metadata))
+            else:
+                response = self._execute(self.execute_slug, plan.prompts[0])
+
+            # Salva a resposta em um arquivo Markdown
+            self._save_to_markdown(response.get("result", ""))
+        except Exception as e:
+            print(f"Erro ao realizar a chamada para StackSpot AI: {e}")
+
+    def _execute(self, execute_slug, prompt):
+        """Executa um prompt pelo QuickCommandManager, reaproveitando o cache de resultados"""
+        print(f"prompt: {prompt}")
+        response = self._cached_result(execute_slug, prompt)
+        if response is None:
             execution_id = self.quick_command_manager.execute_quick_command(
-                self.execute_slug, prompt
+                execute_slug, prompt
             )
             callback_url = f"{self.api_url}/quick-commands/callback/{execution_id}"
             response = self.quick_command_manager.poll_quick_command_status(callback_url)
+            self._store_result(execute_slug, prompt, response)
+        return response
 
-            # Salva a resposta em um arquivo Markdown
-            self._save_to_markdown(response.get("result", ""))
+    def _execute_many(self, commands, async_quick_command_manager):
+        """
+        Executa vários prompts de forma concorrente; apenas os que não têm
+        resposta em cache vão para a API. Retorna as respostas (ou exceções) na ordem de `commands`.
+        """
+        responses = [self._cached_result(execute_slug, prompt) for execute_slug, prompt in commands]
+        pending = [index for index, response in enumerate(responses) if response is None]
+        fetched = async_quick_command_manager.run_many_sync(
+            [commands[index] for index in pending]
+        ) if pending else []
+        for index, response in zip(pending, fetched):
+            responses[index] = response
+            if not isinstance(response, Exception):
+                self._store_result(commands[index][0], commands[index][1], response)
+        return responses
+
+    def _get_async_quick_command_manager(self):
+        """Gerenciador assíncrono usado para executar as partes de um prompt dividido"""
+        if self.async_quick_command_manager is None:
+            self.async_quick_command_manager = AsyncQuickCommandManager(
+                api_url=self.quick_command_manager.api_url,
+                callback_api_url=self.api_url,
+                token_manager=self.token_manager or self.quick_command_manager.token_manager,
+                max_concurrency=self.max_file_workers,
+            )
+        return self.async_quick_command_manager
+
+    def _cached_result(self, execute_slug, prompt):
+        """Retorna a resposta em cache para o prompt, se houver e o cache estiver habilitado"""
+        if self.result_cache is None or not self.use_result_cache:
+            return None
+        response = self.result_cache.get(result_cache_key(execute_slug, prompt, self.model_tag))
+        if response is not None:
+            print(f"Resposta reaproveitada do cache ({execute_slug}).")
+        return response
+
+    def _store_result(self, execute_slug, prompt, response):
+        """Guarda a resposta concluída no cache de resultados"""
+        if self.result_cache is None:
+            return
+        try:
+            self.result_cache.put(result_cache_key(execute_slug, prompt, self.model_tag), execute_slug, response)
         except Exception as e:
-            print(f"Erro ao realizar a chamada para StackSpot AI: {e}")
+            print(f"Erro ao gravar resposta no cache: {e}")
+
+    def _resolve_execute_slug(self):
+        """Ajusta o execute_slug com base no tipo de documentação"""
+        if self.documentation_type == "Negócio":
+            self.execute_slug = "rqc-domain-documentation"
+        elif self.documentation_type == "Técnica":
+            self.execute_slug = "rqc-tech-documentation"
 
     def _build_prompt(self):
         """Constrói o prompt para a StackSpot AI com base nos dados processados."""
+        return self._build_prompt_header() + "".join(self._build_dependency_sections())
+
+    def _plan_prompts(self):
+        """Divide o prompt em partes, se necessário, mantendo a classe principal em todas"""
+        return PromptPlanner(self.max_prompt_chars).plan(
+            self._build_prompt_header(), self._build_dependency_sections()
+        )
+
+    def _build_prompt_header(self):
+        """Parte do prompt comum a todas as partes: metadados e classe principal."""
         if self.documentation_type == "Negócio":
             # Prompt para documentação de negócio
-            prompt = f"""
+            return f"""
             # {self.metadata.get('name', '')}
             {self.metadata.get('description', '')}.Extrair ou realizar um recorte as funcionalidades específica do domínio, como parte de uma estratégia de modernização do ecossistema. Utilize a abordagem de estrangulamento para realizar essa extração, garantindo que o escopo e os critérios sejam bem definidos. Certifique-se de documentar o processo, os desafios enfrentados e os resultados esperados.
 
@@ -161,25 +326,95 @@ class FileProcessor:
 
             Domínios Secundários:
             """
-            for dependency in self.dependencies:
-                prompt += self._build_dependency_prompt(dependency)
         elif self.documentation_type == "Técnica":
             # Prompt para documentação técnica (apenas classes)
-            prompt = f"""
+            return f"""
             Classe:
             {self.main_class_code}
             """
-            for dependency in self.dependencies:
-                prompt += self._build_dependency_prompt(dependency)
-        else:
-            raise ValueError("Tipo de documentação inválido ou não especificado.")
-        
-        return prompt
+        raise ValueError("Tipo de documentação inválido ou não especificado.")
+
+    def _build_dependency_sections(self):
+        """
+        Uma seção de prompt por unidade de documentação, com as dependências e
+        as suas subdependências. As classes de um mesmo ciclo ficam na mesma
+        seção, para que o PromptPlanner não as separe entre as partes.
+        """
+        return [self._build_unit_section(unit) for level in self._documentation_levels() for unit in level]
+
+    def _build_unit_section(self, unit):
+        """Seção de prompt de uma unidade de documentação (uma dependência ou um ciclo)"""
+        return "".join(self._build_dependency_prompt(dependency) for dependency in unit)
+
+    def _documentation_levels(self):
+        """
+        Agrupa as dependências segundo o `documentation_order` do JSON: níveis
+        das folhas para a classe principal, cada um com as suas unidades (uma
+        dependência ou todas as de um ciclo). Dependências fora da ordem, ou sem
+        ordem informada, formam uma unidade cada, em um nível final e na ordem original.
+        """
+        def normalize(path):
+            return os.path.normcase(os.path.abspath(path)) if path else ""
+
+        position_of = {}
+        for level_number, level in enumerate(self.documentation_order):
+            for unit_number, unit in enumerate(level):
+                for documented_class in unit.get("classes", []):
+                    position_of.setdefault(normalize(documented_class.get("file_path", "")), (level_number, unit_number))
+
+        levels = {}
+        for index, dependency in enumerate(self.dependencies):
+            position = position_of.get(normalize(dependency.get("path", "")))
+            level, unit = position if position is not None else (len(self.documentation_order), index)
+            levels.setdefault(level, {}).setdefault(unit, []).append(dependency)
+        return [
+            [units[unit] for unit in sorted(units)]
+            for _, units in sorted(levels.items())
+        ]
+
+    def _execute_levels(self, levels):
+        """
+        Documenta as unidades nível a nível, das folhas para a classe principal:
+        as unidades de um mesmo nível são executadas em paralelo e o nível
+        seguinte só começa quando o anterior termina. As respostas são unificadas
+        em uma execução final.
+        """
+        header = self._build_prompt_header()
+        plan = PromptPlanner(self.max_prompt_chars).plan_units(
+            header, [self._build_unit_section(unit) for level in levels for unit in level]
+        )
+        if not plan.chunked:
+            return self._execute(self.execute_slug, plan.prompts[0])
+
+        prompts = iter(plan.prompts)
+        parts = []
+        for level in levels:
+            level_parts = self._execute_many(
+                [(self.execute_slug, next(prompts)) for _ in level],
+                self._get_async_quick_command_manager(),
+            )
+            for part in level_parts:
+                if isinstance(part, Exception):
+                    raise part
+            parts.extend(level_parts)
+        return self._execute(self.execute_slug, self._build_merge_prompt(parts, self.metadata))
+
+    def _build_merge_prompt(self, responses, metadata):
+        """Prompt da execução que unifica as respostas das partes de um domínio."""
+        documentation = "\n".join(
+            f"<parte numero=\"{number}\">\n{response.get('result', '')}\n</parte>"
+            for number, response in enumerate(responses, start=1)
+        )
+        return PromptsManager.get_prompt(
+            PromptsManager.MERGE_PROMPT_ID, replacement=metadata.get('name', ''), documentation=documentation
+        )
 
     def _build_dependency_prompt(self, dependency):
         """Constrói o prompt para uma dependência, incluindo subdependências."""
         dependency_path = dependency.get("path", "")
-        dependency_code = self.dependency_contents.get(dependency_path, "Código não encontrado ou não processado.")
+        dependency_code = self._class_code(
+            dependency_path, dependency.get('methods', []), "Código não encontrado ou não processado."
+        )
         
         prompt = f"""
         Classe:
@@ -194,7 +429,9 @@ class FileProcessor:
     def _build_subdependency_prompt(self, subdependency):
         """Constrói o prompt para uma subdependência."""
         subdependency_path = subdependency.get("path", "")
-        subdependency_code = self.subdependency_contents.get(subdependency_path, "Código não encontrado ou não processado.")
+        subdependency_code = self._class_code(
+            subdependency_path, subdependency.get('methods', []), "Código não encontrado ou não processado."
+        )
         
         prompt = f"""
             Classe:
@@ -203,12 +440,14 @@ class FileProcessor:
         """
         return prompt
 
-    def _save_to_markdown(self, response):
+    def _save_to_markdown(self, response, metadata=None, documentation_type=None):
         """Salva a resposta em um arquivo Markdown."""
+        metadata = self.metadata if metadata is None else metadata
+        documentation_type = documentation_type or self.documentation_type
         # Define o diretório de saída com base no tipo de documentação
-        if self.documentation_type == "Negócio":
+        if documentation_type == "Negócio":
             output_dir = "output/business"
-        elif self.documentation_type == "Técnica":
+        elif documentation_type == "Técnica":
             output_dir = "output/technical"
         else:
             raise ValueError("Tipo de documentação inválido ou não especificado.")
@@ -218,7 +457,7 @@ class FileProcessor:
             os.makedirs(output_dir)
 
         # Define o nome do arquivo com base em metadata.name
-        file_name = self.metadata.get("name", "default_name").replace(" ", "_").lower()
+        file_name = metadata.get("name", "default_name").replace(" ", "_").lower()
         file_path = os.path.join(output_dir, f"{file_name}.md")
 
         # Salva o conteúdo no arquivo
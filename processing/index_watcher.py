@@ -0,0 +1,103 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from processing.symbol_index import SymbolIndex, update_symbol_index, walk_cs_files
+
+
+class IndexWatcher:
+    def __init__(
+        self,
+        base_path: str,
+        symbol_index: SymbolIndex,
+        interval: float = 5.0,
+        should_ignore: Optional[Callable[[str], bool]] = None,
+        on_change: Optional[Callable[[Dict[str, List[str]]], None]] = None,
+    ):
+        """
+        Monitora a pasta do projeto por polling e mantém o índice de símbolos atualizado.
+
+        Args:
+            base_path (str): Pasta monitorada.
+            symbol_index (SymbolIndex): Índice que será atualizado.
+            interval (float): Intervalo, em segundos, entre as verificações.
+            should_ignore (callable): Filtro de pastas e arquivos ignorados.
+            on_change (callable): Chamado com o resumo da atualização quando algo mudar.
+        """
+        self.base_path = base_path
+        self.symbol_index = symbol_index
+        self.interval = interval
+        self.should_ignore = should_ignore
+        self.on_change = on_change
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Inicia o monitoramento em uma thread de background"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="index-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Interrompe o monitoramento"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @contextmanager
+    def suspended(self):
+        """
+        Para o monitor e fecha a conexão com o índice enquanto a pasta do
+        projeto é substituída (upload ou clone); ao final, reabre o índice no
+        mesmo caminho e retoma o monitoramento se ele estava ativo.
+        """
+        running = self.is_running()
+        self.stop()
+        db_path = self.symbol_index.db_path
+        self.symbol_index.close()
+        try:
+            yield self
+        finally:
+            self.symbol_index = SymbolIndex(db_path)
+            if running:
+                self.start()
+
+    def poll(self) -> Dict[str, List[str]]:
+        """Executa uma verificação e retorna os arquivos adicionados, alterados e removidos"""
+        summary = update_symbol_index(
+            self.symbol_index, list(walk_cs_files(self.base_path, self.should_ignore))
+        )
+        if self.on_change and any(summary.values()):
+            self.on_change(summary)
+        return summary
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Erro ao monitorar a pasta '{self.base_path}': {e}")
+            self._stop_event.wait(self.interval)
+
+
+_watchers: Dict[str, IndexWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_index_watcher(base_path: str, create: Optional[Callable[[], IndexWatcher]] = None) -> Optional[IndexWatcher]:
+    """
+    Monitor da pasta, único por processo. Se ainda não existir, é criado por
+    `create`; sem `create`, retorna None em vez de criá-lo.
+    """
+    key = os.path.normcase(os.path.abspath(base_path))
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None and create is not None:
+            watcher = _watchers[key] = create()
+        return watcher
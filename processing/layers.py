@@ -0,0 +1,57 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List
+
+# Padrões de nomenclatura (camadas) oferecidos no controle "Nomenclaturas";
+# a posição na lista é o bit da camada na máscara
+LAYER_PATTERNS = [
+    "controller", "business", "model", "view", "api", "service", "resource", "event", "handler",
+    "listener", "microservice", "gateway", "proxy", "repository", "entity", "dto",
+    "dao", "aggregate", "valueobject", "factory", "specification", "test", "spec",
+    "mock", "stub", "fixture", "component", "directive", "module", "widget",
+    "middleware", "interceptor", "adapter", "logger", "monitor", "metrics", "auth",
+    "authorization", "authentication", "token", "config", "settings", "env",
+    "deployment", "schema", "migration", "seeder", "index", "layout", "template",
+    "style", "theme", "helper", "util", "common", "base", "core"
+]
+
+_EXTENSION_PATTERN = re.compile(r'\.\w+$')
+_LAYER_REGEXES = [re.compile(rf'\b{pattern}\b', flags=re.IGNORECASE) for pattern in LAYER_PATTERNS]
+_LAYER_BITS = {pattern: 1 << position for position, pattern in enumerate(LAYER_PATTERNS)}
+
+
+def layer_mask(file_path: str) -> int:
+    """
+    Classifica o caminho nas camadas cujo nome aparece como palavra inteira
+    (sem diferenciar maiúsculas), desconsiderando a extensão do arquivo.
+    """
+    path = _EXTENSION_PATTERN.sub('', file_path)
+    mask = 0
+    for position, regex in enumerate(_LAYER_REGEXES):
+        if regex.search(path):
+            mask |= 1 << position
+    return mask
+
+
+def patterns_mask(patterns: Iterable[str]) -> int:
+    """Converte os padrões selecionados na máscara usada no teste bit a bit"""
+    mask = 0
+    for pattern in patterns:
+        mask |= _LAYER_BITS.get(pattern, 0)
+    return mask
+
+
+@lru_cache(maxsize=64)
+def _custom_regex(pattern: str):
+    return re.compile(rf'\b{pattern}\b', flags=re.IGNORECASE)
+
+
+def unknown_patterns(patterns: Iterable[str]) -> List[str]:
+    """Padrões que não fazem parte de LAYER_PATTERNS e, portanto, não têm bit na máscara"""
+    return [pattern for pattern in patterns if pattern not in _LAYER_BITS]
+
+
+def matches_patterns(file_path: str, patterns: Iterable[str]) -> bool:
+    """Verifica padrões fora de LAYER_PATTERNS com a mesma regra de layer_mask"""
+    path = _EXTENSION_PATTERN.sub('', file_path)
+    return any(_custom_regex(pattern).search(path) for pattern in patterns)
@@ -0,0 +1,192 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+from processing.csharp_lexer import TRIVIA_PATTERN
+
+_TYPE_DECLARATION = re.compile(r'(?<![\w.])(class|struct|record|interface)\s+(\w+)')
+_NESTED_TYPE = re.compile(r'(?<![\w.])(?:class|struct|record|interface|enum)\s+(\w+)')
+_STRUCTURAL = re.compile(r'[{}()\[\];]')
+_BODY_START = re.compile(r'[{;]')
+_HEADER_END = re.compile(r'=>|[{}();=]')
+_ATTRIBUTES = re.compile(r'\s*(?:\[[^\]]*\]\s*)*')
+_METHOD_NAME = re.compile(r'(~?\w+)\s*(?:<[^()]*>)?\s*$')
+_GENERIC_ARGS = re.compile(r'<[^<>]*>')
+_DECLARATOR = re.compile(r'(\w+)\s*(?:,|$)')
+_IDENTIFIER = re.compile(r'[^\W\d]\w*')
+_SIGNIFICANT = re.compile(r'\S')
+
+METHOD = "method"
+CONSTRUCTOR = "constructor"
+PROPERTY = "property"
+FIELD = "field"
+NESTED_TYPE = "type"
+
+
+@dataclass
+class Member:
+    """Um membro de uma classe: trecho [start, end) do código e os nomes que declara"""
+    kind: str
+    names: List[str]
+    start: int
+    end: int
+
+
+def _mask(code: str) -> str:
+    """
+    Troca comentários, diretivas e literais por espaços do mesmo tamanho, para
+    que chaves, parênteses e nomes dentro deles não sejam considerados
+    """
+    return TRIVIA_PATTERN.sub(lambda match: ' ' * len(match.group()), code)
+
+
+def _normalize_method(name: str) -> str:
+    """'Servico.Calcular(int, decimal)' -> 'Calcular'"""
+    return name.split('(', 1)[0].strip().rsplit('.', 1)[-1]
+
+
+def _matching_brace(masked: str, open_position: int) -> int:
+    """Posição da chave que fecha a chave em `open_position` (ou o fim do texto)"""
+    depth = 0
+    for match in _STRUCTURAL.finditer(masked, open_position):
+        char = match.group()
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    return len(masked)
+
+
+def _split_members(masked: str, start: int, end: int) -> List[Member]:
+    """
+    Divide o corpo de uma classe em membros. Um membro termina em `;` ou no
+    fechamento de um bloco, no nível do corpo; blocos seguidos de `=` ou `;`
+    (propriedades com inicializador, lambdas em campos) continuam no membro.
+    """
+    members = []
+    depth = 0
+    member_start = start
+    for match in _STRUCTURAL.finditer(masked, start, end):
+        char = match.group()
+        if char in '({[':
+            depth += 1
+            continue
+        if char in ')]':
+            depth -= 1
+            continue
+        if char == '}':
+            depth -= 1
+            if depth != 0:
+                continue
+            following = _SIGNIFICANT.search(masked, match.end(), end)
+            if following and following.group() in ';=':
+                continue
+        elif depth != 0:
+            continue
+        member = _classify(masked, member_start, match.end())
+        if member:
+            members.append(member)
+        member_start = match.end()
+    return members
+
+
+def _classify(masked: str, start: int, end: int) -> Optional[Member]:
+    """Identifica o tipo de membro e os nomes declarados pelo cabeçalho"""
+    header_start = _ATTRIBUTES.match(masked, start, end).end()
+    if header_start >= end:
+        return None
+    nested = _NESTED_TYPE.search(masked, header_start, end)
+    header_end = _HEADER_END.search(masked, header_start, end)
+    if nested and (header_end is None or nested.start() < header_end.start()):
+        return Member(NESTED_TYPE, [nested.group(1)], start, end)
+    if header_end is None:
+        return None
+    header = masked[header_start:header_end.start()]
+    delimiter = header_end.group()
+    if not header.strip():
+        return None
+    if delimiter == '(':
+        name = _METHOD_NAME.search(header)
+        return Member(METHOD, [name.group(1)] if name else [], start, end)
+    if delimiter in ('{', '=>'):
+        names = _IDENTIFIER.findall(header)
+        return Member(PROPERTY, names[-1:], start, end)
+    # Campos: 'int a, b;' ou 'Dictionary<int, string> _cache = ...;'
+    declarators = _GENERIC_ARGS.sub('', _GENERIC_ARGS.sub('', header.strip()))
+    return Member(FIELD, _DECLARATOR.findall(declarators), start, end)
+
+
+def _select(masked: str, members: List[Member], type_name: str, methods: Set[str]) -> Set[int]:
+    """
+    Membros mantidos: os métodos pedidos, os construtores e, transitivamente,
+    tudo que eles referenciam na própria classe (métodos chamados, campos,
+    propriedades e tipos aninhados).
+    """
+    by_name: Dict[str, List[int]] = {}
+    for index, member in enumerate(members):
+        if member.kind == METHOD and member.names == [type_name]:
+            member.kind = CONSTRUCTOR
+        for name in member.names:
+            by_name.setdefault(name, []).append(index)
+
+    pending = [
+        index for index, member in enumerate(members)
+        if member.kind == CONSTRUCTOR or (member.kind == METHOD and set(member.names) & methods)
+    ]
+    selected = set(pending)
+    while pending:
+        member = members[pending.pop()]
+        for name in set(_IDENTIFIER.findall(masked, member.start, member.end)):
+            for index in by_name.get(name, ()):
+                if index not in selected:
+                    selected.add(index)
+                    pending.append(index)
+    return selected
+
+
+def slice_methods(code: str, methods: Iterable[str]) -> Optional[str]:
+    """
+    Recorta de um arquivo C# apenas os métodos pedidos (todas as sobrecargas),
+    os métodos da mesma classe que eles chamam, os campos e propriedades que
+    usam e os construtores; os demais membros são trocados por um comentário
+    que indica quantos foram omitidos.
+
+    Funciona sobre o código original ou já minificado. Retorna None quando
+    nenhum dos métodos é encontrado, para que o arquivo seja usado inteiro.
+    """
+    wanted = {_normalize_method(name) for name in methods or []}
+    wanted.discard('')
+    if not code or not wanted:
+        return None
+
+    masked = _mask(code)
+    pieces = []
+    position = 0
+    found = False
+    for declaration in _TYPE_DECLARATION.finditer(masked):
+        if declaration.start() < position:
+            # Tipo aninhado em uma classe já recortada
+            continue
+        body = _BODY_START.search(masked, declaration.end())
+        if body is None or body.group() != '{':
+            # record sem corpo: 'record Ponto(int X, int Y);'
+            continue
+        body_end = _matching_brace(masked, body.start())
+        members = _split_members(masked, body.end(), body_end)
+        if not any(member.kind == METHOD and set(member.names) & wanted for member in members):
+            continue
+        selected = _select(masked, members, declaration.group(2), wanted)
+        found = True
+        pieces.append(code[position:body.end()])
+        for index, member in enumerate(members):
+            if index in selected:
+                pieces.append(code[member.start:member.end])
+        omitted = len(members) - len(selected)
+        if omitted:
+            pieces.append(f" /* ... {omitted} membro(s) omitido(s) ... */ ")
+        position = body_end
+    if not found:
+        return None
+    pieces.append(code[position:])
+    return ''.join(pieces)
@@ -0,0 +1,91 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable, List, Sequence
+
+STOP_WORDS = [
+    "controller", "model", "view", "api", "service", "resource", "event", "handler",
+    "listener", "microservice", "gateway", "proxy", "repository", "entity", "dto",
+    "dao", "aggregate", "valueobject", "factory", "specification", "test", "spec",
+    "mock", "stub", "fixture", "component", "directive", "module", "widget",
+    "middleware", "interceptor", "adapter", "logger", "monitor", "metrics", "auth",
+    "authorization", "authentication", "token", "config", "settings", "env",
+    "deployment", "schema", "migration", "seeder", "index", "layout", "template",
+    "style", "theme", "helper", "util", "common", "base", "core", "Controller", "Model", "View", "Api", "Service", "Resource", "Event", "Handler",
+    "Listener", "Microservice", "Gateway", "Proxy", "Repository", "Entity", "Dto",
+    "Dao", "Aggregate", "Valueobject", "Factory", "Specification", "Test", "Spec",
+    "Mock", "Stub", "Fixture", "Component", "Directive", "Module", "Widget",
+    "Middleware", "Interceptor", "Adapter", "Logger", "Monitor", "Metrics", "Auth",
+    "Authorization", "Authentication", "Token", "Config", "Settings", "Env",
+    "Deployment", "Schema", "Migration", "Seeder", "Index", "Layout", "Template",
+    "Style", "Theme", "Helper", "Util", "Common", "Base", "Core"
+]
+
+_EXTENSION_PATTERN = re.compile(r'\.\w+$')
+_SEPARATOR_PATTERN = re.compile(r'[-_.\s]+')
+
+# Nomes normalizados mantidos por normalizador; o processo do Streamlit vive por muito tempo
+NORMALIZE_CACHE_SIZE = 65536
+
+
+class NameNormalizer:
+    """
+    Remove stop words de nomes de arquivos e classes.
+
+    O resultado é idêntico ao da remoção sequencial original (uma regex
+    case-insensitive por palavra, na ordem da lista): as regex são compiladas
+    uma única vez, um padrão único descarta de imediato os nomes sem nenhuma
+    stop word e, em nomes ASCII, cada palavra só é aplicada quando aparece no
+    nome em minúsculas.
+    """
+
+    def __init__(self, stop_words: Sequence[str]):
+        self.stop_words = list(stop_words)
+        self._patterns = [
+            (word.lower(), re.compile(re.escape(word), flags=re.IGNORECASE))
+            for word in self.stop_words
+        ]
+        self._any = re.compile(
+            '|'.join(re.escape(word) for word in sorted(set(self.stop_words), key=len, reverse=True)) or r'(?!)',
+            flags=re.IGNORECASE,
+        )
+        self._ascii_words = all(word.isascii() for word in self.stop_words)
+        # Cache por instância (e limitado), para não prender o normalizador num cache global
+        self.normalize = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self.normalize)
+        self.signature = hashlib.sha1('\n'.join(self.stop_words).encode('utf-8', 'surrogateescape')).hexdigest()
+
+    def normalize(self, file_name: str) -> str:
+        """Remove a extensão e as stop words do nome, normalizando os separadores"""
+        name = _EXTENSION_PATTERN.sub('', file_name)
+        if self._any.search(name):
+            name = self._strip_stop_words(name)
+        return _SEPARATOR_PATTERN.sub(' ', name).strip()
+
+    def normalize_many(self, names: Iterable[str]) -> List[str]:
+        """Normaliza uma lista de nomes de uma vez, reaproveitando os já normalizados"""
+        return [self.normalize(name) for name in names]
+
+    def _strip_stop_words(self, name: str) -> str:
+        if not (self._ascii_words and name.isascii()):
+            # IGNORECASE também casa caracteres como 'ſ' e 'K' (Kelvin), que lower() não mapeia
+            for _, pattern in self._patterns:
+                name = pattern.sub('', name)
+            return name
+
+        lowered = name.lower()
+        for word, pattern in self._patterns:
+            if word in lowered:
+                name = pattern.sub('', name)
+                lowered = name.lower()
+        return name
+
+
+@lru_cache(maxsize=8)
+def get_normalizer(stop_words: tuple) -> NameNormalizer:
+    """Retorna o normalizador (e o seu cache) compartilhado para uma lista de stop words"""
+    return NameNormalizer(stop_words)
+
+
+def clean_file_name(file_name, stop_words):
+    """Remove a extensão, as stop_words (case insensitive) e separadores extras do nome"""
+    return get_normalizer(tuple(stop_words)).normalize(file_name)
@@ -0,0 +1,15 @@
+import os
+from typing import Optional
+
+# Abaixo deste número de arquivos o custo de subir o pool supera o ganho
+PARALLEL_THRESHOLD = 64
+
+
+def resolve_workers(max_workers: Optional[int] = None) -> int:
+    """Número de processos do pool: o informado ou a quantidade de CPUs"""
+    return max_workers or os.cpu_count() or 1
+
+
+def pool_chunksize(task_count: int, max_workers: int) -> int:
+    """Tamanho dos blocos do executor.map: cerca de quatro blocos por processo"""
+    return max(1, task_count // (max_workers * 4))
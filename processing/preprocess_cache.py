@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import astuple
+from typing import Dict, Iterable, Optional, Tuple
+from processing.csharp_minifier import MINIFIER_VERSION
+from utils.sqlite_cache import SqliteLruCache
+
+PREPROCESS_CACHE_FILE = "preprocess_cache.db"
+# Local padrão, compartilhado pelo app Streamlit e pelo script.py (ambos executados na raiz do projeto)
+DEFAULT_PREPROCESS_CACHE_PATH = os.path.join("output", PREPROCESS_CACHE_FILE)
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS preprocessed (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_preprocessed_accessed_at ON preprocessed(accessed_at);
+"""
+
+
+def preprocess_cache_key(source: str, options) -> str:
+    """Chave do resultado: hash do conteúdo, das opções e da versão do pré-processamento"""
+    digest = hashlib.sha1(f"{MINIFIER_VERSION}\0{astuple(options)}\0".encode('utf-8'))
+    digest.update(source.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class PreprocessCache(SqliteLruCache):
+    """
+    Cache persistente (SQLite) do código já pré-processado.
+
+    Como a chave é o hash do conteúdo, o mesmo arquivo em pastas ou projetos
+    diferentes reaproveita a mesma entrada; quando o total de bytes passa de
+    `max_bytes`, as entradas usadas há mais tempo são removidas.
+    """
+
+    table = "preprocessed"
+    schema = _SCHEMA
+
+    def __init__(self, db_path: str = DEFAULT_PREPROCESS_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        # O app e a action podem usar o arquivo ao mesmo tempo: espera mais pelo lock do SQLite
+        super().__init__(db_path, max_bytes, timeout=30)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Retorna o conteúdo das chaves encontradas, marcando-as como usadas"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock, self._conn:
+            # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+            for start in range(0, len(keys), 500):
+                block = keys[start:start + 500]
+                placeholders = ",".join("?" * len(block))
+                found.update(self._conn.execute(
+                    f"SELECT key, content FROM preprocessed WHERE key IN ({placeholders})", block
+                ).fetchall())
+            now = time.time()
+            self._conn.executemany("UPDATE preprocessed SET accessed_at = ? WHERE key = ?", [(now, key) for key in found])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, str]]):
+        """Grava vários resultados em uma transação e remove os excedentes"""
+        now = time.time()
+        rows = [(key, content, len(content.encode('utf-8', 'surrogatepass')), now) for key, content in entries]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO preprocessed (key, content, size, accessed_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self._evict()
+
+
+_caches: Dict[str, PreprocessCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_preprocess_cache(db_path: Optional[str] = None) -> PreprocessCache:
+    """
+    Cache compartilhado do processo para o caminho informado; sem caminho,
+    usa PREPROCESS_CACHE_PATH do ambiente ou DEFAULT_PREPROCESS_CACHE_PATH.
+    """
+    db_path = db_path or os.getenv('PREPROCESS_CACHE_PATH') or DEFAULT_PREPROCESS_CACHE_PATH
+    key = os.path.normcase(os.path.abspath(db_path))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = PreprocessCache(db_path)
+        return cache
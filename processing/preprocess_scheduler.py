@@ -0,0 +1,88 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from processing.file_handler_processor import DEFAULT_OPTIONS, PreprocessOptions, process_files
+from processing.preprocess_cache import PreprocessCache
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class PreprocessNode:
+    """Um arquivo distinto da estrutura do domínio e o estado do seu pré-processamento"""
+    path: str
+    status: str = PENDING
+    content: Optional[str] = None
+
+
+def _node_key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class PreprocessScheduler:
+    """
+    Achata a estrutura classe principal -> dependências -> subdependências em
+    um conjunto de arquivos distintos, pré-processa cada um uma única vez e
+    devolve o conteúdo de qualquer caminho da hierarquia.
+
+    Um arquivo que aparece sob vários pais (ou escrito de formas diferentes,
+    como 'a/../b.cs') vira um único nó. Com
+    `cache`, arquivos inalterados desde uma execução anterior não são
+    pré-processados de novo.
+    """
+
+    def __init__(
+        self,
+        options: PreprocessOptions = DEFAULT_OPTIONS,
+        max_workers: Optional[int] = None,
+        cache: Optional[PreprocessCache] = None,
+    ):
+        self.options = options
+        self.max_workers = max_workers
+        self.cache = cache
+        self.nodes: Dict[str, PreprocessNode] = {}
+
+    def add(self, path: str) -> Optional[PreprocessNode]:
+        """Registra um arquivo; retorna o nó já existente se o arquivo se repetir"""
+        if not path:
+            return None
+        key = _node_key(path)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = PreprocessNode(path=path)
+        return node
+
+    def add_dependencies(self, dependencies: List[Dict]):
+        """Registra as dependências e, recursivamente, as suas subdependências"""
+        for dependency in dependencies or []:
+            self.add(dependency.get("path", ""))
+            self.add_dependencies(dependency.get("subdependencies", []))
+
+    def run(self) -> Dict[str, int]:
+        """Pré-processa os arquivos pendentes e retorna o progresso"""
+        pending = {node.path: node for node in self.nodes.values() if node.status == PENDING}
+
+        def on_result(path, content):
+            node = pending[path]
+            node.content = content
+            node.status = DONE if content is not None else FAILED
+
+        process_files(list(pending), self.options, self.max_workers, progress=on_result, cache=self.cache)
+        return self.progress()
+
+    def progress(self) -> Dict[str, int]:
+        """Quantidade de arquivos por estado"""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for node in self.nodes.values():
+            counts[node.status] += 1
+        counts["total"] = len(self.nodes)
+        return counts
+
+    def content(self, path: str, default: Optional[str] = None) -> Optional[str]:
+        """Conteúdo pré-processado de um caminho da hierarquia"""
+        node = self.nodes.get(_node_key(path)) if path else None
+        if node is None or node.content is None:
+            return default
+        return node.content
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from processing.dependency_graph import DependencyGraph
+from processing.symbol_index import (
+    SYMBOL_INDEX_FILE,
+    SymbolIndex,
+    build_symbol_index,
+    update_symbol_index,
+    walk_cs_files,
+)
+
+
+@dataclass
+class ProjectModel:
+    """Visão do projeto compartilhada entre os analisadores: índice de símbolos e mapa classe -> arquivo"""
+    project_root: str
+    symbol_index: SymbolIndex
+    fingerprint: str
+    class_files: Dict[str, str] = field(default_factory=dict)
+    _graph: Optional[DependencyGraph] = field(default=None, repr=False)
+    _graph_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def dependency_graph(self) -> DependencyGraph:
+        """Grafo de dependências do projeto, montado na primeira consulta"""
+        with self._graph_lock:
+            if self._graph is None:
+                self._graph = DependencyGraph.from_symbol_index(self.symbol_index, self.class_files)
+            return self._graph
+
+
+# Índices criados pela ferramenta ficam em uma pasta própria, nunca no projeto analisado
+INDEX_CACHE_DIR = os.path.join("output", "indexes")
+
+_models: Dict[Tuple[str, str], ProjectModel] = {}
+_models_lock = threading.Lock()
+
+
+def project_fingerprint(entries: List[Tuple[str, str]]) -> str:
+    """
+    Calcula a impressão digital do projeto a partir do caminho, tamanho e mtime
+    de cada arquivo .cs, sem ler o conteúdo.
+    """
+    digest = hashlib.sha1()
+    for _, path in entries:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def default_index_path(project_root: str) -> str:
+    """
+    Caminho padrão do índice de símbolos de um projeto: um arquivo por pasta
+    analisada em SYMBOL_INDEX_DIR (variável de ambiente) ou INDEX_CACHE_DIR.
+    """
+    root = os.path.normcase(os.path.abspath(project_root))
+    name = os.path.basename(root.rstrip(os.sep)) or "projeto"
+    digest = hashlib.sha1(root.encode('utf-8', 'surrogateescape')).hexdigest()[:12]
+    directory = os.getenv('SYMBOL_INDEX_DIR') or INDEX_CACHE_DIR
+    return os.path.join(directory, f"{name}-{digest}-{SYMBOL_INDEX_FILE}")
+
+
+def get_project_model(
+    project_root: str,
+    symbol_index: Optional[SymbolIndex] = None,
+    max_workers: Optional[int] = None,
+    revalidate: bool = True,
+) -> ProjectModel:
+    """
+    Retorna o modelo do projeto, reaproveitando o que já foi carregado.
+
+    O modelo é reconstruído (de forma incremental) apenas quando a impressão
+    digital dos arquivos muda; enquanto ela for a mesma, todas as consultas e
+    instâncias de analisador usam o mesmo objeto. Com `revalidate=False` um
+    modelo já carregado é devolvido sem percorrer a pasta novamente (útil em
+    lotes que analisam o mesmo retrato do projeto). Sem `symbol_index`, o
+    índice fica em default_index_path, fora da pasta do projeto.
+    """
+    if symbol_index is None:
+        db_path = default_index_path(project_root)
+    else:
+        db_path = symbol_index.db_path
+    key = (os.path.normcase(os.path.abspath(project_root)), os.path.normcase(os.path.abspath(db_path)))
+
+    if not revalidate:
+        with _models_lock:
+            model = _models.get(key)
+        if model:
+            return model
+
+    entries = list(walk_cs_files(project_root))
+    fingerprint = project_fingerprint(entries)
+
+    with _models_lock:
+        model = _models.get(key)
+        if model and model.fingerprint == fingerprint:
+            return model
+
+        index = symbol_index or (model.symbol_index if model else SymbolIndex(db_path))
+        if index.is_empty():
+            build_symbol_index(index, entries, max_workers)
+        else:
+            update_symbol_index(index, entries, max_workers)
+
+        model = ProjectModel(
+            project_root=project_root,
+            symbol_index=index,
+            fingerprint=fingerprint,
+            class_files=index.class_files(),
+        )
+        _models[key] = model
+        return model
+
+
+def reset_after_fork():
+    """
+    Esquece os modelos herdados do processo pai. As conexões SQLite não podem
+    ser usadas depois de um fork: apenas as referências são descartadas (sem
+    fechá-las, pois pertencem ao pai) e o próximo acesso abre o índice de novo.
+    """
+    global _models_lock
+    _models_lock = threading.Lock()
+    _models.clear()
+
+
+def open_project_model(project_root: str, db_path: str, fingerprint: str) -> ProjectModel:
+    """
+    Registra o modelo de um índice já atualizado por outro processo, abrindo
+    uma conexão própria e sem percorrer a pasta do projeto novamente.
+    """
+    index = SymbolIndex(db_path)
+    model = ProjectModel(
+        project_root=project_root,
+        symbol_index=index,
+        fingerprint=fingerprint,
+        class_files=index.class_files(),
+    )
+    key = (os.path.normcase(os.path.abspath(project_root)), os.path.normcase(os.path.abspath(db_path)))
+    with _models_lock:
+        _models[key] = model
+    return model
+
+
+def invalidate_project_model(project_root: Optional[str] = None):
+    """Descarta o modelo em cache de um projeto ou, sem argumento, de todos"""
+    with _models_lock:
+        if project_root is None:
+            _models.clear()
+            return
+        root = os.path.normcase(os.path.abspath(project_root))
+        for key in [key for key in _models if key[0] == root]:
+            del _models[key]
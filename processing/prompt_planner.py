@@ -0,0 +1,92 @@
+import math
+from dataclasses import dataclass, field
+from typing import List
+
+# Limite padrão de tamanho de um prompt enviado em uma única execução
+DEFAULT_MAX_PROMPT_CHARS = 60000
+# Aproximação usada para estimar tokens a partir de caracteres (código e português)
+CHARS_PER_TOKEN = 4
+# Aviso acrescentado ao fim de cada parte de um prompt dividido
+PART_NOTE = "\n(Parte {number} de {total} do domínio: as demais dependências são analisadas em outras partes.)\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa simples do número de tokens de um texto"""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+@dataclass
+class PromptPlan:
+    """Prompts a executar para um domínio; com mais de um, as respostas precisam ser unificadas"""
+    prompts: List[str] = field(default_factory=list)
+    total_chars: int = 0
+
+    @property
+    def chunked(self) -> bool:
+        return len(self.prompts) > 1
+
+
+class PromptPlanner:
+    """
+    Divide o prompt de um domínio em partes que respeitem `max_chars`.
+
+    Todas as partes começam pelo mesmo cabeçalho (classe principal e
+    metadados), para que cada execução tenha o contexto do domínio; as seções
+    das dependências são distribuídas em ordem, sem separar uma dependência
+    das suas subdependências.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_PROMPT_CHARS):
+        self.max_chars = max_chars
+
+    def plan(self, header: str, sections: List[str]) -> PromptPlan:
+        total_chars = len(header) + sum(len(section) for section in sections)
+        if total_chars <= self.max_chars:
+            return PromptPlan([header + "".join(sections)], total_chars)
+
+        budget = self.max_chars - len(header) - len(PART_NOTE.format(number=99, total=99))
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_size = 0
+        for section in sections:
+            if current and current_size + len(section) > budget:
+                groups.append(current)
+                current, current_size = [], 0
+            if len(section) > budget:
+                print(f"Dependência com {len(section)} caracteres excede o limite do prompt; enviada em uma parte própria.")
+            current.append(section)
+            current_size += len(section)
+        if current or not groups:
+            groups.append(current)
+
+        if len(groups) == 1:
+            # Uma única dependência (ou nenhuma) excede sozinha o limite: dividir não reduziria o prompt
+            return PromptPlan([header + "".join(groups[0])], total_chars)
+
+        prompts = [
+            header + "".join(group) + PART_NOTE.format(number=number, total=len(groups))
+            for number, group in enumerate(groups, start=1)
+        ]
+        print(
+            f"Prompt com {total_chars} caracteres (~{estimate_tokens(header) + sum(estimate_tokens(s) for s in sections)} tokens) "
+            f"dividido em {len(prompts)} partes."
+        )
+        return PromptPlan(prompts, total_chars)
+
+    def plan_units(self, header: str, units: List[str]) -> PromptPlan:
+        """
+        Um prompt por unidade de documentação (dependências de um mesmo ciclo já
+        agrupadas em uma seção), para que as unidades de um mesmo nível sejam
+        executadas em paralelo; uma unidade nunca é dividida.
+        """
+        total_chars = len(header) + sum(len(unit) for unit in units)
+        if len(units) <= 1:
+            return PromptPlan([header + "".join(units)], total_chars)
+        for unit in units:
+            if len(header) + len(unit) > self.max_chars:
+                print(f"Unidade com {len(unit)} caracteres excede o limite do prompt; enviada inteira.")
+        prompts = [
+            header + unit + PART_NOTE.format(number=number, total=len(units))
+            for number, unit in enumerate(units, start=1)
+        ]
+        return PromptPlan(prompts, total_chars)
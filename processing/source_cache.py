@@ -0,0 +1,111 @@
+import codecs
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def decode_source(data: bytes) -> str:
+    """Decodifica o conteúdo de um arquivo fonte identificando o BOM e usando latin-1 como fallback."""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding)
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        # latin-1 aceita qualquer sequência de bytes: não é preciso ler o arquivo de novo
+        return data.decode('latin-1')
+
+
+class SourceCache:
+    """
+    Cache LRU do texto decodificado dos arquivos fonte.
+
+    O limite é o total de bytes dos arquivos em cache; uma entrada é
+    invalidada quando o mtime ou o tamanho do arquivo mudam.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, file_path: str) -> str:
+        """Retorna o texto do arquivo, lendo e decodificando apenas se não estiver em cache"""
+        key = os.path.normcase(os.path.abspath(file_path))
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        text = decode_source(data)
+        self._store(key, signature, text, len(data))
+        return text
+
+    def _store(self, key: str, signature: tuple, text: str, size: int):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._current_bytes -= previous[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (signature, text, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Remove um arquivo do cache ou, sem argumento, esvazia o cache"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._current_bytes = 0
+                return
+            entry = self._entries.pop(os.path.normcase(os.path.abspath(file_path)), None)
+            if entry:
+                self._current_bytes -= entry[2]
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna as estatísticas de uso do cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Instância compartilhada por analisadores e processadores de arquivos
+source_cache = SourceCache()
+
+
+def read_source(file_path: str) -> str:
+    """Lê um arquivo fonte através do cache compartilhado"""
+    return source_cache.read(file_path)
@@ -0,0 +1,505 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from processing.csharp_lexer import extract_references
+from processing.layers import layer_mask
+from processing.parallel import PARALLEL_THRESHOLD, pool_chunksize, resolve_workers
+from processing.source_cache import decode_source
+
+SYMBOL_INDEX_FILE = "index.db"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    class_name TEXT,
+    namespace TEXT,
+    size INTEGER,
+    mtime REAL,
+    hash TEXT,
+    layers INTEGER
+);
+CREATE TABLE IF NOT EXISTS base_types (
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_interface INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS similar_classes (
+    signature TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    match_name TEXT NOT NULL,
+    score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS similarity_classes (
+    words_signature TEXT NOT NULL,
+    class_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS normalized_names (
+    signature TEXT NOT NULL,
+    name TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    PRIMARY KEY (signature, name)
+);
+CREATE INDEX IF NOT EXISTS idx_files_class_name ON files(class_name);
+CREATE INDEX IF NOT EXISTS idx_base_types_key ON base_types(key);
+CREATE INDEX IF NOT EXISTS idx_base_types_name ON base_types(name);
+CREATE INDEX IF NOT EXISTS idx_refs_key ON refs(key);
+"""
+
+
+@dataclass
+class FileSymbols:
+    """Símbolos extraídos de um arquivo .cs"""
+    path: str
+    file_name: str
+    class_name: Optional[str]
+    namespace: Optional[str]
+    size: int
+    mtime: float
+    hash: str
+    layers: int = 0
+    base_types: List[str] = field(default_factory=list)
+    # Nomes na ordem em que o lexer os emitiu, para que a árvore não dependa do hash das strings
+    references: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def interfaces(self) -> List[str]:
+        """Tipos base que seguem a convenção de nome de interface (IAlgo)"""
+        return [name for name in self.base_types if _is_interface_name(name)]
+
+
+def _is_interface_name(name: str) -> bool:
+    return len(name) > 1 and name[0] == 'I' and name[1].isupper()
+
+
+def index_key(path: str) -> str:
+    """Normaliza o caminho usado como chave no índice"""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def extract_file_symbols(
+    file_path: str,
+    file_name: Optional[str] = None,
+    data: Optional[bytes] = None,
+    stat: Optional[os.stat_result] = None,
+) -> Optional[FileSymbols]:
+    """Lê o arquivo uma única vez e extrai todos os símbolos usados pelos analisadores"""
+    # Importação tardia: os analisadores também importam este módulo
+    from processing.class_processor import CSharpClassAnalyzer as FlatAnalyzer
+    from processing.class_processor_v2 import CSharpClassAnalyzer as TypedAnalyzer
+
+    try:
+        stat = stat or os.stat(file_path)
+        if data is None:
+            with open(file_path, 'rb') as file:
+                data = file.read()
+    except OSError as e:
+        print(f"Erro ao indexar arquivo {file_path}: {str(e)}")
+        return None
+
+    # Uma única passada do lexer alimenta os dois formatos de referência
+    parsed = extract_references(decode_source(data))
+    emitted = {
+        name: rank for rank, name in enumerate(dict.fromkeys(
+            name
+            for kinds in TypedAnalyzer.LEXER_PATTERN_KINDS.values()
+            for kind in kinds
+            for name in parsed.references.get(kind, ())
+        ))
+    }
+    references = {
+        kind: sorted(names, key=lambda name: (emitted.get(name, len(emitted)), name))
+        for kind, names in TypedAnalyzer().dependencies_from_references(parsed).items()
+    }
+    references['reference'] = FlatAnalyzer().dependencies_from_references(parsed)
+
+    return FileSymbols(
+        path=file_path,
+        file_name=file_name or os.path.basename(file_path),
+        class_name=parsed.main_class,
+        namespace=parsed.namespace,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        hash=hashlib.sha1(data).hexdigest(),
+        layers=layer_mask(file_path),
+        base_types=list(parsed.class_bases),
+        references=references,
+    )
+
+
+def walk_cs_files(base_path: str, should_ignore: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[str, str]]:
+    """Percorre o projeto com os.scandir e retorna (nome, caminho) de cada arquivo .cs em ordem determinística"""
+    should_ignore = should_ignore or (lambda name: False)
+    pending = [base_path]
+    while pending:
+        root = pending.pop()
+        try:
+            with os.scandir(root) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Erro ao listar a pasta {root}: {str(e)}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                # Filtra pastas a serem ignoradas
+                if not should_ignore(entry.name):
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".cs") and not should_ignore(entry.name):
+                yield entry.name, entry.path
+        # Pilha invertida para visitar as subpastas em ordem alfabética
+        pending.extend(reversed(subdirs))
+
+
+def _index_entry(task: Tuple[str, str, Optional[str]]):
+    """
+    Lê e analisa um arquivo dentro de um worker do pool de processos.
+
+    Retorna a tupla ('touched', caminho, tamanho, mtime) quando o hash do
+    conteúdo é igual ao já indexado, ('record', FileSymbols) quando o arquivo
+    foi analisado ou None em caso de erro.
+    """
+    file_name, path, previous_hash = task
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError as e:
+        print(f"Erro ao indexar arquivo {path}: {str(e)}")
+        return None
+
+    if previous_hash and previous_hash == hashlib.sha1(data).hexdigest():
+        return 'touched', path, stat.st_size, stat.st_mtime
+    record = extract_file_symbols(path, file_name, data=data, stat=stat)
+    return ('record', record) if record else None
+
+
+def _run_index_tasks(tasks: List[Tuple[str, str, Optional[str]]], max_workers: Optional[int] = None) -> list:
+    """Distribui as tarefas em um pool de processos, preservando a ordem de entrada"""
+    max_workers = resolve_workers(max_workers)
+    if max_workers <= 1 or len(tasks) < PARALLEL_THRESHOLD:
+        return [_index_entry(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # executor.map devolve os resultados na ordem das tarefas: o merge é determinístico
+        return list(executor.map(_index_entry, tasks, chunksize=pool_chunksize(len(tasks), max_workers)))
+
+
+def build_symbol_index(index: 'SymbolIndex', entries: List[Tuple[str, str]], max_workers: Optional[int] = None) -> int:
+    """Extrai os símbolos dos arquivos informados e reconstrói o índice"""
+    results = _run_index_tasks([(file_name, path, None) for file_name, path in entries], max_workers)
+    records = [result[1] for result in results if result]
+    index.clear()
+    index.upsert_many(records)
+    return len(records)
+
+
+def update_symbol_index(
+    index: 'SymbolIndex',
+    entries: List[Tuple[str, str]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """
+    Atualiza o índice de forma incremental.
+
+    Arquivos com tamanho e mtime iguais aos indexados são ignorados; os demais
+    têm o hash do conteúdo comparado e só são analisados novamente se o
+    conteúdo mudou. Arquivos que não estão mais em `entries` são removidos.
+    """
+    known = index.file_stats()
+    summary = {"added": [], "changed": [], "removed": []}
+    tasks = []
+    seen = set()
+
+    for file_name, path in entries:
+        key = index_key(path)
+        seen.add(key)
+        previous = known.get(key)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Erro ao indexar arquivo {path}: {str(e)}")
+            continue
+        if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime:
+            continue
+        tasks.append((file_name, path, previous[2] if previous else None))
+
+    records = []
+    touched = []
+    for result in _run_index_tasks(tasks, max_workers):
+        if not result:
+            continue
+        if result[0] == 'touched':
+            # Apenas o mtime mudou (ex.: arquivo extraído novamente de um ZIP)
+            touched.append(result[1:])
+            continue
+        record = result[1]
+        records.append(record)
+        summary["changed" if index_key(record.path) in known else "added"].append(record.path)
+
+    # Caminhos reais, como em 'added' e 'changed' (as chaves do índice são normalizadas)
+    summary["removed"] = [previous[3] for key, previous in known.items() if key not in seen]
+    index.touch_many(touched)
+    index.upsert_many(records)
+    index.remove_many(summary["removed"])
+    return summary
+
+
+class SymbolIndex:
+    """
+    Armazena em SQLite os símbolos dos arquivos .cs indexados.
+
+    As referências são guardadas por tipo: 'instance', 'static', 'inheritance'
+    e 'interfaces' (formato de class_processor_v2) e 'reference' (lista plana
+    usada por class_processor).
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # O Streamlit executa cada rerun em uma thread diferente
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+            if 'layers' not in columns:
+                # Índices criados antes da classificação por camada
+                self._conn.execute("ALTER TABLE files ADD COLUMN layers INTEGER")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def clear(self):
+        """Remove todos os registros do índice"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM refs")
+            self._conn.execute("DELETE FROM base_types")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM similar_classes")
+            self._conn.execute("DELETE FROM similarity_classes")
+            self._conn.execute("DELETE FROM normalized_names")
+
+    def upsert_many(self, records: List[FileSymbols]):
+        """Insere ou substitui os símbolos de vários arquivos em uma única transação"""
+        with self._lock, self._conn:
+            for record in records:
+                key = index_key(record.path)
+                self._delete_key(key)
+                self._conn.execute(
+                    "INSERT INTO files (key, path, file_name, class_name, namespace, size, mtime, hash, layers) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, record.path, record.file_name, record.class_name, record.namespace,
+                     record.size, record.mtime, record.hash, record.layers),
+                )
+                self._conn.executemany(
+                    "INSERT INTO base_types (key, name, is_interface) VALUES (?, ?, ?)",
+                    [(key, name, int(_is_interface_name(name))) for name in record.base_types],
+                )
+                self._conn.executemany(
+                    "INSERT INTO refs (key, kind, name) VALUES (?, ?, ?)",
+                    [(key, kind, name) for kind, names in record.references.items() for name in names],
+                )
+
+    def touch_many(self, stats: List[Tuple[str, int, float]]):
+        """Atualiza tamanho e mtime de arquivos cujo conteúdo não mudou"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE files SET size = ?, mtime = ? WHERE key = ?",
+                [(size, mtime, index_key(path)) for path, size, mtime in stats],
+            )
+
+    def remove_many(self, paths: List[str]):
+        """Remove os arquivos informados do índice"""
+        with self._lock, self._conn:
+            for path in paths:
+                self._delete_key(index_key(path))
+
+    def _delete_key(self, key: str):
+        self._conn.execute("DELETE FROM refs WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM base_types WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM files WHERE key = ?", (key,))
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def is_empty(self) -> bool:
+        return not self._query("SELECT 1 FROM files LIMIT 1")
+
+    def files(self) -> List[Dict[str, str]]:
+        """Retorna os arquivos no mesmo formato do index.json"""
+        return [
+            {"file_name": file_name, "path": path}
+            for file_name, path in self._query("SELECT file_name, path FROM files ORDER BY key")
+        ]
+
+    def class_files(self) -> Dict[str, str]:
+        """Mapeia o nome da classe principal de cada arquivo para o seu caminho"""
+        return {
+            class_name: path
+            for class_name, path in self._query(
+                "SELECT class_name, path FROM files WHERE class_name IS NOT NULL ORDER BY key"
+            )
+        }
+
+    def class_name(self, path: str) -> Optional[str]:
+        rows = self._query("SELECT class_name FROM files WHERE key = ?", (index_key(path),))
+        return rows[0][0] if rows else None
+
+    def contains(self, path: str) -> bool:
+        return bool(self._query("SELECT 1 FROM files WHERE key = ?", (index_key(path),)))
+
+    def references(self, path: str) -> Dict[str, List[str]]:
+        """Retorna as referências extraídas do arquivo, agrupadas por tipo, na ordem do código"""
+        references: Dict[str, List[str]] = {}
+        for kind, name in self._query("SELECT kind, name FROM refs WHERE key = ? ORDER BY rowid", (index_key(path),)):
+            references.setdefault(kind, []).append(name)
+        return references
+
+    def base_types(self, path: str) -> List[str]:
+        return [
+            name for (name,) in self._query(
+                "SELECT name FROM base_types WHERE key = ? ORDER BY rowid", (index_key(path),)
+            )
+        ]
+
+    def all_references(self) -> Dict[str, Dict[str, List[str]]]:
+        """Retorna as referências de todos os arquivos, pela chave do índice, em uma única consulta"""
+        references: Dict[str, Dict[str, List[str]]] = {}
+        for key, kind, name in self._query("SELECT key, kind, name FROM refs ORDER BY rowid"):
+            references.setdefault(key, {}).setdefault(kind, []).append(name)
+        return references
+
+    def all_implementations(self) -> List[Tuple[str, str, str]]:
+        """Retorna (tipo base, classe, caminho) de todas as heranças e implementações indexadas"""
+        return self._query(
+            "SELECT DISTINCT b.name, f.class_name, f.path FROM base_types b JOIN files f ON f.key = b.key "
+            "WHERE f.class_name IS NOT NULL ORDER BY b.name, f.key"
+        )
+
+    def implementations(self, base_type: str) -> List[Tuple[str, str]]:
+        """Retorna (classe, caminho) dos arquivos cujas classes herdam ou implementam o tipo informado"""
+        return self._query(
+            "SELECT DISTINCT f.class_name, f.path FROM base_types b JOIN files f ON f.key = b.key "
+            "WHERE b.name = ? AND f.class_name IS NOT NULL ORDER BY f.key",
+            (base_type,),
+        )
+
+    def save_similarities(
+        self,
+        signature: str,
+        table: Dict[str, List[Tuple[str, float]]],
+        class_names: Optional[List[str]] = None,
+        words_signature: Optional[str] = None,
+    ):
+        """
+        Substitui a tabela de similaridade entre nomes de classes pela calculada
+        para `signature`. Com `class_names` e `words_signature` (stop words), a
+        tabela pode ser atualizada depois por previous_similarities.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM similarity_classes")
+            if class_names is not None and words_signature is not None:
+                self._conn.executemany(
+                    "INSERT INTO similarity_classes (words_signature, class_name) VALUES (?, ?)",
+                    [(words_signature, class_name) for class_name in class_names],
+                )
+            self._conn.execute("DELETE FROM similar_classes")
+            self._conn.executemany(
+                "INSERT INTO similar_classes (signature, class_name, rank, match_name, score) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (signature, class_name, rank, match_name, score)
+                    for class_name, matches in table.items()
+                    for rank, (match_name, score) in enumerate(matches)
+                ],
+            )
+
+    def similarities(self, signature: str) -> Optional[Dict[str, List[Tuple[str, float]]]]:
+        """Retorna a tabela de similaridade salva, ou None se ela foi calculada para outro conjunto de classes"""
+        rows = self._query(
+            "SELECT class_name, match_name, score FROM similar_classes WHERE signature = ? "
+            "ORDER BY class_name, rank",
+            (signature,),
+        )
+        if not rows:
+            return None
+        table: Dict[str, List[Tuple[str, float]]] = {}
+        for class_name, match_name, score in rows:
+            table.setdefault(class_name, []).append((match_name, score))
+        return table
+
+    def previous_similarities(self, words_signature: str) -> Optional[Tuple[List[str], Dict[str, List[Tuple[str, float]]]]]:
+        """
+        Retorna (classes, tabela) da última tabela de similaridade salva com as
+        mesmas stop words, qualquer que seja o conjunto de classes, ou None.
+        """
+        class_names = [
+            class_name for (class_name,) in self._query(
+                "SELECT class_name FROM similarity_classes WHERE words_signature = ? ORDER BY rowid",
+                (words_signature,),
+            )
+        ]
+        if not class_names:
+            return None
+        table: Dict[str, List[Tuple[str, float]]] = {}
+        for class_name, match_name, score in self._query(
+            "SELECT class_name, match_name, score FROM similar_classes ORDER BY class_name, rank"
+        ):
+            table.setdefault(class_name, []).append((match_name, score))
+        return class_names, table
+
+    def save_normalized_names(self, signature: str, names: Dict[str, str]):
+        """Guarda os nomes de classe já normalizados para a lista de stop words identificada por `signature`"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO normalized_names (signature, name, normalized) VALUES (?, ?, ?)",
+                [(signature, name, normalized) for name, normalized in names.items()],
+            )
+
+    def normalized_names(self, signature: str) -> Dict[str, str]:
+        return dict(self._query("SELECT name, normalized FROM normalized_names WHERE signature = ?", (signature,)))
+
+    def layer_masks(self) -> Dict[str, int]:
+        """Retorna a máscara de camadas de cada arquivo, pela chave do índice"""
+        return {
+            key: layers
+            for key, layers in self._query("SELECT key, layers FROM files WHERE layers IS NOT NULL")
+        }
+
+    def file_stats(self) -> Dict[str, tuple]:
+        """Retorna (tamanho, mtime, hash, caminho) de cada arquivo indexado, pela chave do índice"""
+        return {
+            key: (size, mtime, file_hash, path)
+            for key, size, mtime, file_hash, path in self._query("SELECT key, size, mtime, hash, path FROM files")
+        }
+
+
+_indexes: Dict[str, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(db_path: str) -> SymbolIndex:
+    """Índice compartilhado do processo para o caminho informado (uma conexão por arquivo)"""
+    key = index_key(os.path.abspath(db_path))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SymbolIndex(db_path)
+        return index
@@ -4,8 +4,9 @@ from stackspot_ai.token_manager import TokenManager
 from stackspot_ai.knowledge_sources_manager import KnowledgeSourcesManager
 from stackspot_ai.remote_quick_command_manager import QuickCommandManager
 from stackspot_ai.prompts_manager import PromptsManager
-from processing.class_processor import CSharpDependencyAnalyzer
+from processing.class_processor_v2 import CSharpDependencyAnalyzer
 from processing.file_handler_processor import FileHandlerProcessor
+from processing.controller_batch import analyze_controllers, is_batch_request, resolve_controllers
 
 # %%
 def run(metadata):
@@ -16,11 +17,22 @@ def run(metadata):
     client_id = metadata.inputs.get('client_id')
     client_secret = metadata.inputs.get('client_secret')
     controller_path = metadata.inputs.get('controller_path')
+    output_path = metadata.inputs.get('output_path') or "outputs/controllers"
+    max_depth = int(metadata.inputs.get('max_depth') or 2)
+    max_workers = int(metadata.inputs.get('max_workers') or 0) or None
+
+    if is_batch_request(controller_path):
+        # Modo em lote: lista, glob ou todos os controllers do projeto
+        controllers = resolve_controllers(project_path, controller_path)
+        summary = analyze_controllers(project_path, controllers, output_path, max_depth=max_depth, max_workers=max_workers)
+        print("=== Controllers Summary ===")
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
 
     analyzer = CSharpDependencyAnalyzer(project_path)
     analyzer.initialize()
 
-    controller_dependency = analyzer.analyze_dependencies_tree(controller_path, max_depth=2)
+    controller_dependency = analyzer.analyze_dependencies_tree(controller_path, max_depth=max_depth)
     json_data = analyzer.generate_controller_json_report(controller_dependency)
 
     print("=== Controller JSON Report ===")
@@ -0,0 +1,195 @@
+import asyncio
+from stackspot_ai.http_session import get_session
+from stackspot_ai.polling import ExponentialBackoffPolling, resolve_polling_strategy
+
+
+class AsyncQuickCommandManager:
+    def __init__(
+        self,
+        api_url,
+        callback_api_url,
+        token_manager,
+        use_conversation_id=True,
+        initial_token=None,
+        max_concurrency=10,
+        polling_strategy=None,
+    ):
+        """
+        Versão assíncrona do QuickCommandManager, para executar vários comandos rápidos ao mesmo tempo.
+
+        As requisições usam a sessão HTTP compartilhada, executadas em threads com
+        asyncio.to_thread; o semáforo limita quantas requisições HTTP ficam em
+        andamento ao mesmo tempo, mas não a espera entre as verificações de
+        status, de modo que N execuções levam aproximadamente o tempo da mais lenta.
+
+        :param api_url: URL de criação de execuções (ex.: .../v1/quick-commands/create-execution).
+        :param callback_api_url: URL base da API usada para montar o callback (ex.: .../v1).
+        :param token_manager: Instância de TokenManager para gerenciar tokens.
+        :param use_conversation_id: Indica se o conversation_id deve ser usado.
+        :param initial_token: Token inicial; as requisições usam sempre o token do TokenManager,
+            que o renova antes de expirar.
+        :param max_concurrency: Número máximo de requisições simultâneas.
+        :param polling_strategy: Estratégia de polling do status (padrão: ExponentialBackoffPolling).
+        """
+        self.api_url = api_url
+        self.callback_api_url = callback_api_url
+        self.token_manager = token_manager
+        self.use_conversation_id = use_conversation_id
+        self.access_token = initial_token
+        self.max_concurrency = max_concurrency
+        self.polling_strategy = polling_strategy or ExponentialBackoffPolling()
+        self.last_403_method = None
+        self.conversation_id = None
+        # Criados sob demanda: precisam pertencer ao event loop em execução
+        self._semaphore = None
+        self._refresh_lock = None
+        self._loop = None
+
+    def _ensure_primitives(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._refresh_lock = asyncio.Lock()
+
+    async def _request(self, method, url, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(get_session().request, method, url, **kwargs)
+
+    async def _current_token(self):
+        """Token para a próxima requisição, renovado pelo TokenManager antes de expirar"""
+        self.access_token = await asyncio.to_thread(self.token_manager.get_token)
+        return self.access_token
+
+    async def _refresh_token(self, stale_token):
+        """
+        Atualiza o token de acesso uma única vez por expiração: se outra
+        execução já trocou o token que recebeu 403, apenas reutiliza o novo.
+        """
+        async with self._refresh_lock:
+            if self.access_token and self.access_token != stale_token:
+                return self.access_token
+            await asyncio.to_thread(self.token_manager.refresh_token, stale_token)
+            self.access_token = await asyncio.to_thread(self.token_manager.get_token)
+            return self.access_token
+
+    async def execute_quick_command(self, execute_slug, file_data, conversation_id=None):
+        """
+        Executa um comando rápido na API da StackSpot.
+
+        :param execute_slug: Slug do comando a ser executado.
+        :param file_data: Dados a serem enviados no payload.
+        :param conversation_id: Conversa a continuar; por padrão, a última concluída por este gerenciador.
+        :return: ID da execução do comando.
+        """
+        self._ensure_primitives()
+        use_manager_conversation = conversation_id is None
+        if use_manager_conversation:
+            conversation_id = self.conversation_id
+
+        url = f"{self.api_url}/{execute_slug}"
+        if self.use_conversation_id and conversation_id:
+            url = f"{url}?conversation_id={conversation_id}"
+        print(f"url: {url}")
+
+        token = await self._current_token()
+        for attempt in range(2):
+            headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+            response = await self._request("POST", url, headers=headers, json={"input_data": file_data})
+            if response.status_code == 200:
+                execution_id = response.json().strip('"')
+                if not execution_id:
+                    raise Exception("execution_id não encontrado na resposta da API.")
+                # Reseta o conversation_id após a execução
+                if use_manager_conversation:
+                    self.conversation_id = None
+                return execution_id
+            if response.status_code == 403 and attempt == 0:  # Token expirado
+                print("execute_quick_command: Token expirado. Atualizando...")
+                self.last_403_method = "execute_quick_command"
+                token = await self._refresh_token(token)
+                continue
+            if attempt == 1:
+                raise Exception(f"Erro ao executar comando após atualização do token: {response.status_code} - {response.text}")
+            raise Exception(f"Erro ao executar comando: {response.status_code} - {response.text}")
+
+    async def poll_quick_command_status(
+        self,
+        callback_url,
+        polling_interval=None,
+        max_retries=None,
+        polling_strategy=None,
+        use_manager_conversation=True,
+    ):
+        """
+        Verifica o status de execução de um Quick Command na API de Callback.
+
+        :param callback_url: URL de callback para verificar o status.
+        :param polling_interval: Intervalo fixo entre as tentativas (usa FixedIntervalPolling).
+        :param max_retries: Número máximo de tentativas (usa FixedIntervalPolling).
+        :param polling_strategy: Estratégia de polling; por padrão, a do gerenciador.
+        :param use_manager_conversation: Se a execução usou a conversa do gerenciador; só então
+            o conversation_id retornado passa a ser a conversa do gerenciador.
+        :return: Dados da execução do comando.
+        """
+        self._ensure_primitives()
+        session = resolve_polling_strategy(self.polling_strategy, polling_interval, max_retries, polling_strategy).start()
+
+        while True:
+            token = await self._current_token()
+            response = await self._request("GET", callback_url, headers={"Authorization": f"Bearer {token}"})
+            status = None
+
+            if response.status_code == 200:
+                data = response.json()
+                status = data.get("progress").get("status")
+                if status == "COMPLETED":
+                    print("Comando finalizado com sucesso.")
+                    if self.use_conversation_id and use_manager_conversation:
+                        self.conversation_id = data.get("conversation_id")
+                    return data
+                elif status not in ["RUNNING", "CREATED"]:
+                    raise Exception(f"Status inesperado: {status}")
+            elif response.status_code == 403:  # Token expirado
+                print(f"poll_quick_command_status: Token expirado. Atualizando: {response.text}")
+                self.last_403_method = "poll_quick_command_status"
+                await self._refresh_token(token)
+            else:
+                raise Exception(f"Erro ao consultar status: {response.status_code} - {response.text}")
+
+            delay = session.next_delay(status)
+            if delay is None:
+                break
+            if status:
+                print(f"Comando ainda em execução ({status}). {session.describe()}.")
+            await asyncio.sleep(delay)
+
+        raise Exception("Número máximo de tentativas atingido. O comando não foi concluído.")
+
+    async def run_quick_command(self, execute_slug, file_data, conversation_id=None):
+        """Executa um comando rápido e aguarda o resultado"""
+        execution_id = await self.execute_quick_command(execute_slug, file_data, conversation_id)
+        return await self.poll_quick_command_status(
+            f"{self.callback_api_url}/quick-commands/callback/{execution_id}",
+            use_manager_conversation=conversation_id is None,
+        )
+
+    async def run_many(self, commands):
+        """
+        Executa vários comandos rápidos de forma concorrente.
+
+        Cada execução é independente: nenhuma delas continua a conversa
+        guardada no gerenciador. O resultado mantém a ordem de `commands`; uma execução que
+        falhar retorna a exceção na sua posição, sem interromper as outras.
+
+        :param commands: Lista de tuplas (execute_slug, file_data).
+        :return: Lista com os dados de cada execução ou a exceção ocorrida.
+        """
+        return await asyncio.gather(
+            *(self.run_quick_command(execute_slug, file_data, conversation_id='') for execute_slug, file_data in commands),
+            return_exceptions=True,
+        )
+
+    def run_many_sync(self, commands):
+        """Atalho para chamar run_many a partir de código síncrono"""
+        return asyncio.run(self.run_many(commands))
@@ -0,0 +1,83 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Respostas transitórias que valem nova tentativa
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Quantas vezes um 403 (token expirado) pode provocar atualização do token na mesma chamada
+MAX_TOKEN_REFRESHES = 1
+
+DEFAULT_POOL_SIZE = 10
+# Tamanho do pool de conexões por host; a API de quick commands recebe as chamadas concorrentes
+HOST_POOL_SIZES = {
+    "https://genai-code-buddy-api.stackspot.com": 20,
+    "https://idm.stackspot.com": 2,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_retry(total=3, backoff_factor=0.5, backoff_jitter=0.5):
+    """
+    Política de novas tentativas: erros de conexão, resets e respostas em
+    RETRY_STATUS_CODES, com backoff exponencial e jitter. Métodos não
+    idempotentes (POST) só são repetidos em falhas de conexão, antes de a
+    requisição chegar ao servidor.
+    """
+    kwargs = dict(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    try:
+        return Retry(backoff_jitter=backoff_jitter, **kwargs)
+    except TypeError:
+        # urllib3 < 2 não tem backoff_jitter
+        return Retry(**kwargs)
+
+
+def _adapter(pool_size):
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=build_retry())
+
+
+def create_session(host_pool_sizes=None, default_pool_size=DEFAULT_POOL_SIZE):
+    """Cria uma sessão com keep-alive, retry e um pool de conexões dimensionado por host"""
+    session = requests.Session()
+    session.mount("https://", _adapter(default_pool_size))
+    session.mount("http://", _adapter(default_pool_size))
+    for prefix, pool_size in (HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes).items():
+        session.mount(prefix, _adapter(pool_size))
+    return session
+
+
+def get_session():
+    """Sessão compartilhada por TokenManager, QuickCommandManager e KnowledgeSourcesManager"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def request_with_token_refresh(method, url, get_headers, refresh_token, session=None, **kwargs):
+    """
+    Executa a requisição e, em caso de 403, atualiza o token e repete no
+    máximo MAX_TOKEN_REFRESHES vezes, em vez de repetir indefinidamente.
+
+    :param get_headers: Função que monta os cabeçalhos com o token atual.
+    :param refresh_token: Função que atualiza o token.
+    """
+    session = session or get_session()
+    for attempt in range(MAX_TOKEN_REFRESHES + 1):
+        response = session.request(method, url, headers=get_headers(), **kwargs)
+        if response.status_code != 403 or attempt == MAX_TOKEN_REFRESHES:
+            return response
+        refresh_token()
+    return response
@@ -1,4 +1,4 @@
-import requests
+from stackspot_ai.http_session import get_session, request_with_token_refresh
 
 
 class KnowledgeSourcesManager:
@@ -19,6 +19,8 @@ class KnowledgeSourcesManager:
 
         :return: Dicionário com os cabeçalhos.
         """
+        # O TokenManager renova o token antes de expirar; o valor guardado serve de referência no 403
+        self.access_token = self.token_manager.get_token()
         return {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
@@ -28,9 +30,16 @@ class KnowledgeSourcesManager:
         """
         Atualiza o token de acesso.
         """
-        self.token_manager.refresh_token()
+        self.token_manager.refresh_token(self.access_token)
         self.access_token = self.token_manager.get_token()
 
+    def _request(self, method, url, **kwargs):
+        """
+        Executa a requisição pela sessão compartilhada, atualizando o token
+        em caso de 403 um número limitado de vezes.
+        """
+        return request_with_token_refresh(method, url, self._get_headers, self._refresh_token, **kwargs)
+
     def create_knowledge_source(self, slug, name, description, ks_type):
         """
         Cria um novo Knowledge Source.
@@ -48,10 +57,7 @@ class KnowledgeSourcesManager:
             "description": description,
             "type": ks_type
         }
-        response = requests.post(url, headers=self._get_headers(), json=payload)
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.create_knowledge_source(slug, name, description, ks_type)
+        response = self._request("POST", url, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -72,10 +78,7 @@ class KnowledgeSourcesManager:
             "target_type": "KNOWLEDGE_SOURCE",
             "expiration": 600
         }
-        response = requests.post(url, headers=self._get_headers(), json=payload)
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.upload_file(file_name, ks_slug, file_path)
+        response = self._request("POST", url, json=payload)
         response.raise_for_status()
         upload_data = response.json()
 
@@ -84,7 +87,7 @@ class KnowledgeSourcesManager:
         form_data = upload_data["form"]
         with open(file_path, "rb") as file:
             files = {"file": file}
-            response = requests.post(upload_url, data=form_data, files=files)
+            response = get_session().post(upload_url, data=form_data, files=files)
             response.raise_for_status()
 
         return upload_data["id"]
@@ -97,10 +100,7 @@ class KnowledgeSourcesManager:
         :return: Status do upload.
         """
         url = f"{self.base_url}/file-upload/@{upload_id}"
-        response = requests.get(url, headers=self._get_headers())
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.check_upload_status(upload_id)
+        response = self._request("GET", url)
         response.raise_for_status()
         return response.json()
 
@@ -120,10 +120,7 @@ class KnowledgeSourcesManager:
             "code": code,
             "language": language
         }
-        response = requests.post(url, headers=self._get_headers(), json=payload)
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.upload_snippet(ks_slug, use_case, code, language)
+        response = self._request("POST", url, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -137,10 +134,7 @@ class KnowledgeSourcesManager:
         """
         url = f"{self.base_url}/knowledge-sources/{ks_slug}/custom"
         payload = {"content": content}
-        response = requests.post(url, headers=self._get_headers(), json=payload)
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.upload_custom_content(ks_slug, content)
+        response = self._request("POST", url, json=payload)
         response.raise_for_status()
         return response.json()
 
@@ -155,9 +149,6 @@ class KnowledgeSourcesManager:
         url = f"{self.base_url}/knowledge-sources/{ks_slug}/objects"
         if standalone is not None:
             url += f"?standalone={str(standalone).lower()}"
-        response = requests.delete(url, headers=self._get_headers())
-        if response.status_code == 403:
-            self._refresh_token()
-            return self.delete_objects(ks_slug, standalone)
+        response = self._request("DELETE", url)
         response.raise_for_status()
         return response.json()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import random
+import time
+from abc import ABC, abstractmethod
+
+
+class PollingStrategy(ABC):
+    """
+    Define quanto esperar entre as verificações de status de uma execução.
+
+    A estratégia não guarda estado: cada polling chama `start()` e usa a
+    sessão devolvida, o que permite compartilhar a mesma estratégia entre
+    execuções concorrentes.
+    """
+
+    @abstractmethod
+    def start(self):
+        """Inicia o polling de uma execução e devolve a PollingSession correspondente"""
+
+
+class PollingSession(ABC):
+    """Estado do polling de uma execução, criado por PollingStrategy.start()"""
+
+    @abstractmethod
+    def next_delay(self, status):
+        """
+        Retorna quantos segundos esperar antes da próxima verificação, dado o
+        último status recebido (None em respostas sem status, como um 403),
+        ou None quando não se deve mais tentar.
+        """
+
+    def describe(self):
+        """Texto usado nos logs de progresso"""
+        return ""
+
+
+class FixedIntervalPolling(PollingStrategy):
+    """Intervalo fixo e número máximo de tentativas (comportamento original)"""
+
+    def __init__(self, interval=25, max_retries=30):
+        self.interval = interval
+        self.max_retries = max_retries
+
+    def start(self):
+        return _FixedIntervalSession(self)
+
+
+class _FixedIntervalSession(PollingSession):
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.attempt = 0
+
+    def next_delay(self, status):
+        self.attempt += 1
+        if self.attempt >= self.strategy.max_retries:
+            return None
+        return self.strategy.interval
+
+    def describe(self):
+        return f"Tentativa {self.attempt}/{self.strategy.max_retries}"
+
+
+class ExponentialBackoffPolling(PollingStrategy):
+    """
+    Começa com intervalos curtos e os aumenta exponencialmente, com jitter,
+    até `max_interval`, respeitando um prazo total (`deadline`, em segundos).
+
+    O intervalo inicial depende do status: uma execução em fila (CREATED)
+    costuma demorar mais para começar do que uma em andamento (RUNNING) para
+    terminar; quando o status muda, o backoff recomeça do intervalo inicial
+    do novo status.
+    """
+
+    DEFAULT_INITIAL_INTERVALS = {"CREATED": 2.0, "RUNNING": 1.0}
+
+    def __init__(
+        self,
+        initial_interval=1.0,
+        max_interval=20.0,
+        multiplier=1.6,
+        jitter=0.25,
+        deadline=1800.0,
+        status_initial_intervals=None,
+    ):
+        """
+        :param initial_interval: Intervalo inicial para status sem valor próprio.
+        :param max_interval: Maior intervalo entre duas verificações.
+        :param multiplier: Fator de crescimento do intervalo a cada verificação.
+        :param jitter: Variação aleatória relativa (0.25 = ±25%) para não sincronizar execuções.
+        :param deadline: Tempo máximo total de espera, em segundos.
+        :param status_initial_intervals: Intervalo inicial por status.
+        """
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.status_initial_intervals = (
+            self.DEFAULT_INITIAL_INTERVALS if status_initial_intervals is None else status_initial_intervals
+        )
+
+    def start(self):
+        return _ExponentialBackoffSession(self)
+
+
+class _ExponentialBackoffSession(PollingSession):
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.started_at = time.monotonic()
+        self.attempt = 0
+        self.status = None
+        self.status_attempt = 0
+
+    def next_delay(self, status):
+        strategy = self.strategy
+        self.attempt += 1
+        if status is not None and status != self.status:
+            self.status = status
+            self.status_attempt = 0
+
+        remaining = strategy.deadline - (time.monotonic() - self.started_at)
+        if remaining <= 0:
+            return None
+
+        initial = strategy.status_initial_intervals.get(self.status, strategy.initial_interval)
+        delay = min(strategy.max_interval, initial * strategy.multiplier ** self.status_attempt)
+        self.status_attempt += 1
+        delay *= 1 + random.uniform(-strategy.jitter, strategy.jitter)
+        # A última verificação acontece no prazo final
+        return max(0.0, min(delay, remaining))
+
+    def describe(self):
+        elapsed = time.monotonic() - self.started_at
+        return f"Tentativa {self.attempt}, {elapsed:.0f}s de {self.strategy.deadline:.0f}s"
+
+
+def resolve_polling_strategy(default, polling_interval=None, max_retries=None, polling_strategy=None):
+    """
+    Escolhe a estratégia de uma chamada: a informada explicitamente, um
+    intervalo fixo quando `polling_interval`/`max_retries` forem passados
+    (compatível com a assinatura original) ou a estratégia padrão.
+    """
+    if polling_strategy is not None:
+        return polling_strategy
+    if polling_interval is not None or max_retries is not None:
+        return FixedIntervalPolling(
+            25 if polling_interval is None else polling_interval,
+            30 if max_retries is None else max_retries,
+        )
+    return default
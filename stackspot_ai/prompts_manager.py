@@ -85,6 +85,13 @@ class PromptsManager:
         <codigos>${documentation}<codigos>
         Extrair ou realizar um recorte as funcionalidades específica do domínio, como parte de uma estratégia de modernização do ecossistema. Utilize a abordagem de estrangulamento para realizar essa extração, garantindo que o escopo e os critérios sejam bem definidos. Certifique-se de documentar o processo, os desafios enfrentados e os resultados esperados.
     """)
+
+    # Unifica as respostas das partes de um domínio dividido pelo PromptPlanner
+    MERGE_PROMPT_ID = 4
+    PROMPT_4 = Template("""
+    <documentacoes>${documentation}</documentacoes>
+    As documentações acima foram geradas em partes para o mesmo domínio (${replacement}); todas partem da mesma classe principal e cada uma analisa um subconjunto das dependências. Unifique-as em um único documento coeso, mantendo a estrutura de seções das partes, sem repetir o conteúdo comum e sem resumir ou remover informações relevantes de nenhuma das partes. Faça isso e você será recompensado.
+    """)
     
    #  PROMPT_3 = Template("""
    #  <codigos>${documentation}<codigos>
@@ -183,7 +190,7 @@ class PromptsManager:
         """
         Retorna o prompt selecionado com as informações substituídas pelos valores fornecidos.
         
-        :param prompt_id: ID do prompt (1, 2 ou 3).
+        :param prompt_id: ID do prompt (1, 2, 3 ou 4).
         :param replacement: Valor para substituir "source" no prompt.
         :param kwargs: Valores adicionais para substituir no template do prompt.
         :return: Prompt formatado.
@@ -192,6 +199,7 @@ class PromptsManager:
             1: PromptsManager.PROMPT_1,
             2: PromptsManager.PROMPT_2,
             3: PromptsManager.PROMPT_3,
+            4: PromptsManager.PROMPT_4,
         }
         prompt_template = prompts.get(prompt_id)
         if not prompt_template:
@@ -1,16 +1,19 @@
-import requests
 import time
+from stackspot_ai.http_session import get_session
+from stackspot_ai.polling import ExponentialBackoffPolling, resolve_polling_strategy
 
 
 class QuickCommandManager:
-    def __init__(self, api_url, token_manager, use_conversation_id=True, initial_token=None):
+    def __init__(self, api_url, token_manager, use_conversation_id=True, initial_token=None, polling_strategy=None):
         """
         Inicializa o executor de comandos rápidos.
 
         :param api_url: URL base da API da StackSpot.
         :param token_manager: Instância de TokenManager para gerenciar tokens.
         :param use_conversation_id: Indica se o conversation_id deve ser usado.
-        :param initial_token: Token inicial válido, se disponível.
+        :param initial_token: Token inicial; as requisições usam sempre o token do TokenManager,
+            que o renova antes de expirar.
+        :param polling_strategy: Estratégia de polling do status (padrão: ExponentialBackoffPolling).
         """
         self.api_url = api_url
         self.token_manager = token_manager
@@ -18,6 +21,7 @@ class QuickCommandManager:
         self.access_token = initial_token  # Token inicial válido
         self.last_403_method = None  # Armazena o último método que recebeu erro 403
         self.conversation_id = None  # Gerencia o conversation_id internamente
+        self.polling_strategy = polling_strategy or ExponentialBackoffPolling()
 
     def execute_quick_command(self, execute_slug, file_data):
         """
@@ -37,14 +41,11 @@ class QuickCommandManager:
             if self.use_conversation_id and self.conversation_id:
                 url = f"{url}?conversation_id={self.conversation_id}"
             print(f"url: {url}")
-            return requests.post(url, headers=headers, json=command_payload)
-
-        if not self.access_token:
-            self.access_token = self.token_manager.get_token()
+            return get_session().post(url, headers=headers, json=command_payload)
 
         response = None
         try:
-            response = make_request(self.access_token)
+            response = make_request(self._current_token())
         except Exception as e:
             print("0 Erro ao converter o corpo da resposta para JSON:", e)
 
@@ -77,24 +78,24 @@ class QuickCommandManager:
         else:
             raise Exception(f"Erro ao executar comando: {response.status_code} - {response.text}")
 
-    def poll_quick_command_status(self, callback_url, polling_interval=25, max_retries=30):
+    def poll_quick_command_status(self, callback_url, polling_interval=None, max_retries=None, polling_strategy=None):
         """
         Verifica o status de execução de um Quick Command na API de Callback.
 
         :param callback_url: URL de callback para verificar o status.
-        :param polling_interval: Intervalo entre as tentativas de polling.
-        :param max_retries: Número máximo de tentativas.
+        :param polling_interval: Intervalo fixo entre as tentativas (usa FixedIntervalPolling).
+        :param max_retries: Número máximo de tentativas (usa FixedIntervalPolling).
+        :param polling_strategy: Estratégia de polling; por padrão, a do gerenciador.
         :return: Dados da execução do comando.
         """
         def make_request(token):
             headers = {"Authorization": f"Bearer {token}"}
-            return requests.get(callback_url, headers=headers)
-
-        if not self.access_token:
-            self.access_token = self.token_manager.get_token()
+            return get_session().get(callback_url, headers=headers)
 
-        for attempt in range(max_retries):
-            response = make_request(self.access_token)
+        session = resolve_polling_strategy(self.polling_strategy, polling_interval, max_retries, polling_strategy).start()
+        while True:
+            response = make_request(self._current_token())
+            status = None
 
             if response.status_code == 200:
                 data = response.json()
@@ -105,9 +106,7 @@ class QuickCommandManager:
                     if self.use_conversation_id:
                         self.conversation_id = data.get("conversation_id")
                     return data
-                elif status in ["RUNNING", "CREATED"]:
-                    print(f"Comando ainda em execução. Tentativa {attempt + 1}/{max_retries}.")
-                else:
+                elif status not in ["RUNNING", "CREATED"]:
                     raise Exception(f"Status inesperado: {status}")
             elif response.status_code == 403:  # Token expirado
                 print(f"poll_quick_command_status: Token expirado. Atualizando: {response.text}")
@@ -116,13 +115,26 @@ class QuickCommandManager:
             else:
                 raise Exception(f"Erro ao consultar status: {response.status_code} - {response.text}")
 
-            time.sleep(polling_interval)
+            delay = session.next_delay(status)
+            if delay is None:
+                break
+            if status:
+                print(f"Comando ainda em execução ({status}). {session.describe()}.")
+            time.sleep(delay)
 
         raise Exception("Número máximo de tentativas atingido. O comando não foi concluído.")
 
+    def _current_token(self):
+        """
+        Token para a próxima requisição: o TokenManager o renova antes de
+        expirar, evitando o 403 da primeira chamada após a expiração.
+        """
+        self.access_token = self.token_manager.get_token()
+        return self.access_token
+
     def _refresh_token(self):
         """
         Atualiza o token de acesso usando o TokenManager.
         """
-        self.token_manager.refresh_token()
+        self.token_manager.refresh_token(self.access_token)
         return self.token_manager.get_token()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from utils.sqlite_cache import SqliteLruCache
+
+RESULT_CACHE_FILE = "result_cache.db"
+DEFAULT_RESULT_CACHE_PATH = os.path.join("output", RESULT_CACHE_FILE)
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    execute_slug TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_accessed_at ON results(accessed_at);
+"""
+
+
+def result_cache_key(execute_slug: str, prompt: str, model_tag: str = "") -> str:
+    """Chave do resultado: hash do quick command, do prompt exato e da versão do modelo"""
+    digest = hashlib.sha256()
+    for part in (execute_slug or "", model_tag or "", prompt or ""):
+        digest.update(part.encode('utf-8', 'surrogateescape'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache(SqliteLruCache):
+    """
+    Cache persistente (SQLite) das respostas de quick commands.
+
+    Uma entrada expira `ttl` segundos após ser gravada; quando o total de
+    bytes passa de `max_bytes`, as entradas usadas há mais tempo são removidas.
+    """
+
+    table = "results"
+    schema = _SCHEMA
+
+    def __init__(self, db_path: str = RESULT_CACHE_FILE, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        super().__init__(db_path, max_bytes)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retorna a resposta guardada para a chave ou None se não existir ou tiver expirado"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, execute_slug: str, response: Dict):
+        """Grava a resposta e remove entradas expiradas ou excedentes"""
+        data = json.dumps(response, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, execute_slug, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, execute_slug, data, size, now, now),
+            )
+            self._conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl,))
+            self._evict()
+
+
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(db_path: Optional[str] = None) -> ResultCache:
+    """
+    Cache compartilhado do processo para o caminho informado; sem caminho,
+    usa RESULT_CACHE_PATH do ambiente ou DEFAULT_RESULT_CACHE_PATH.
+    """
+    db_path = db_path or os.getenv('RESULT_CACHE_PATH') or DEFAULT_RESULT_CACHE_PATH
+    key = os.path.normcase(os.path.abspath(db_path))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ResultCache(db_path)
+        return cache
@@ -1,26 +1,109 @@
-import requests
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from stackspot_ai.http_session import get_session
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+# Validade assumida quando a resposta do IdP não informa expires_in
+DEFAULT_EXPIRES_IN = 900
+
+
+@contextmanager
+def _file_lock(lock_path):
+    """Trava exclusiva entre processos sobre `lock_path` (sem trava se a plataforma não oferecer)"""
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 class TokenManager:
     """
     Classe para gerenciar o token de acesso, garantindo que ele seja reutilizado e atualizado quando necessário.
+
+    O token é renovado antes de expirar (`refresh_margin` segundos antes do
+    `expires_in` informado pelo IdP) e apenas uma renovação fica em andamento
+    por vez. Com `cache_path`, o token é compartilhado em disco entre
+    processos (sessões do Streamlit, execuções da action), protegido por uma
+    trava de arquivo.
     """
-    def __init__(self, account_slug, client_id, client_secret):
+    def __init__(self, account_slug, client_id, client_secret, cache_path=None, refresh_margin=60):
         self.account_slug = account_slug
         self.client_id = client_id
         self.client_secret = client_secret
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
         self.access_token = None
+        self.expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_valid(self, token, expires_at):
+        return bool(token) and expires_at - self.refresh_margin > time.time()
 
     def get_token(self):
         """
-        Retorna o token de acesso atual.
+        Retorna o token de acesso atual, renovando-o se estiver ausente ou perto de expirar.
         """
-        return self.access_token
+        if self._is_valid(self.access_token, self.expires_at):
+            return self.access_token
+        with self._lock:
+            if not self._is_valid(self.access_token, self.expires_at):
+                self._refresh_locked(stale_token=self.access_token)
+            return self.access_token
 
-    def refresh_token(self):
+    def refresh_token(self, stale_token=None):
         """
         Atualiza o token de acesso.
+
+        :param stale_token: Token que foi recusado (403). Se outra thread ou
+            processo já o substituiu por um token válido, este é reaproveitado
+            sem nova chamada ao IdP.
         """
+        with self._lock:
+            if stale_token is not None and self.access_token != stale_token and self._is_valid(self.access_token, self.expires_at):
+                return
+            self._refresh_locked(stale_token=stale_token if stale_token is not None else self.access_token)
+
+    def _refresh_locked(self, stale_token):
+        if not self.cache_path:
+            self._store(*self._request_token())
+            return
+
+        with _file_lock(f"{self.cache_path}.lock"):
+            cached = self._read_cache()
+            if cached and cached[0] != stale_token and self._is_valid(*cached):
+                self._store(*cached)
+                return
+            token, expires_at = self._request_token()
+            self._store(token, expires_at)
+            self._write_cache(token, expires_at)
+
+    def _store(self, token, expires_at):
+        self.access_token = token
+        self.expires_at = expires_at
+
+    def _request_token(self):
         print("Atualizando token de acesso...")
         url = f"https://idm.stackspot.com/{self.account_slug}/oidc/oauth/token"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
@@ -30,9 +113,43 @@ class TokenManager:
             "client_secret": self.client_secret
         }
 
-        response = requests.post(url, headers=headers, data=data)
+        requested_at = time.time()
+        response = get_session().post(url, headers=headers, data=data)
         if response.status_code == 200:
-            self.access_token = response.json().get("access_token")
+            body = response.json()
             print("Token de acesso atualizado com sucesso.")
-        else:
-            raise Exception(f"Erro ao obter token: {response.status_code} - {response.text}")
\ No newline at end of file
+            return body.get("access_token"), requested_at + float(body.get("expires_in") or DEFAULT_EXPIRES_IN)
+        raise Exception(f"Erro ao obter token: {response.status_code} - {response.text}")
+
+    def _cache_key(self):
+        """Identifica as credenciais no cache, sem gravar o client_id em claro"""
+        return hashlib.sha256(f"{self.account_slug}\0{self.client_id}".encode('utf-8')).hexdigest()
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as file:
+                entry = json.load(file).get(self._cache_key())
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not entry:
+            return None
+        return entry.get("access_token"), float(entry.get("expires_at") or 0)
+
+    def _write_cache(self, token, expires_at):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            if not isinstance(cache, dict):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+        cache[self._cache_key()] = {"access_token": token, "expires_at": expires_at}
+
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(cache, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Não foi possível gravar o cache de token: {e}")
@@ -1,5 +1,5 @@
 import re
-from processing.file_handler_processor import FileHandlerProcessor
+from processing.file_handler_processor import FileHandlerProcessor, minify, remove_comments, remove_dead_code, remove_using_lines
 
 # Exemplo de uso
 code = """
@@ -32,4 +32,22 @@ public class Example {
 processor = FileHandlerProcessor()
 processor.initialize(code)
 processed_code = processor.process()
-print(processed_code)
\ No newline at end of file
+print(processed_code)
+
+# Compara com a cadeia de regex original (usings, comentários e espaços),
+# ignorando espaços: diretivas antes dos usings não podem impedir a remoção
+def baseline(source):
+    return minify(remove_dead_code(remove_comments(remove_using_lines(source))))
+
+samples = [
+    code,
+    "#nullable enable\n#pragma warning disable CS1591\nusing System;\nusing A.B;\n\nnamespace N\n{\nusing C.D;\n    public class X { }\n}\n",
+    "#region Usings\nusing System;\n#endregion\nnamespace N { public class Y { void M() { using (var s = Abrir()) { } } } }\n",
+]
+for sample in samples:
+    processor.initialize(sample)
+    expected = re.sub(r'\s+', '', baseline(sample))
+    obtained = re.sub(r'\s+', '', processor.process())
+    assert obtained == expected, (obtained, expected)
+print("Saída equivalente à cadeia de regex original.")
+
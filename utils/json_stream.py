@@ -0,0 +1,146 @@
+import json
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+_OBJECT = "object"
+_ARRAY = "array"
+_END = object()
+
+
+class JsonStreamWriter:
+    """
+    Escreve JSON de forma incremental em qualquer objeto com `write` (arquivo,
+    io.StringIO ou `socket.makefile("w")`), sem montar o documento em memória.
+
+    O documento é descrito por eventos (begin_object, key, value, end_array...)
+    e a saída é igual à de json.dumps com o mesmo `indent`. A memória usada é
+    proporcional apenas à profundidade aberta e ao buffer de escrita.
+    """
+
+    def __init__(self, fp, indent=None, ensure_ascii=True, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.fp = fp
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.buffer_size = buffer_size
+        self._item_separator = "," if indent is not None else ", "
+        # Cada container aberto: [tipo, quantidade de itens já escritos]
+        self._containers = []
+        self._after_key = False
+        self._chunks = []
+        self._size = 0
+
+    def _write(self, text):
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self._drain()
+
+    def _drain(self):
+        if self._chunks:
+            self.fp.write("".join(self._chunks))
+            self._chunks = []
+            self._size = 0
+
+    def _newline(self, level):
+        if self.indent is not None:
+            self._write("\n" + " " * (self.indent * level))
+
+    def _before_item(self):
+        """Separador e indentação antes de um valor (ou de uma chave, em objetos)"""
+        if self._after_key:
+            self._after_key = False
+            return
+        if not self._containers:
+            return
+        container = self._containers[-1]
+        if container[1]:
+            self._write(self._item_separator)
+        container[1] += 1
+        self._newline(len(self._containers))
+
+    def _begin(self, kind, bracket):
+        self._before_item()
+        self._write(bracket)
+        self._containers.append([kind, 0])
+
+    def _end(self, kind, bracket):
+        if not self._containers or self._containers[-1][0] != kind:
+            raise ValueError(f"Nenhum {kind} aberto para fechar")
+        _, count = self._containers.pop()
+        if count:
+            self._newline(len(self._containers))
+        self._write(bracket)
+
+    def begin_object(self):
+        self._begin(_OBJECT, "{")
+
+    def end_object(self):
+        self._end(_OBJECT, "}")
+
+    def begin_array(self):
+        self._begin(_ARRAY, "[")
+
+    def end_array(self):
+        self._end(_ARRAY, "]")
+
+    def key(self, name):
+        """Chave do próximo valor do objeto aberto"""
+        if not self._containers or self._containers[-1][0] != _OBJECT:
+            raise ValueError("Chaves só podem ser escritas dentro de um objeto")
+        self._before_item()
+        if not isinstance(name, str):
+            # Mesma conversão de json.dumps: True -> "true", 1 -> "1", None -> "null"
+            name = json.dumps(name)
+        self._write(json.dumps(name, ensure_ascii=self.ensure_ascii) + ": ")
+        self._after_key = True
+
+    def value(self, obj):
+        """
+        Escreve um valor completo. Dicionários, listas/tuplas e objetos (pelo
+        `__dict__`, como `default=lambda o: o.__dict__`) são percorridos com
+        uma pilha explícita, sem recursão.
+        """
+        pending = [(None, iter((obj,)))]
+        while pending:
+            kind, items = pending[-1]
+            item = next(items, _END)
+            if item is _END:
+                pending.pop()
+                if kind == _OBJECT:
+                    self.end_object()
+                elif kind == _ARRAY:
+                    self.end_array()
+                continue
+            if kind == _OBJECT:
+                name, item = item
+                self.key(name)
+            if item is None or isinstance(item, (str, int, float)):
+                self._before_item()
+                self._write(json.dumps(item, ensure_ascii=self.ensure_ascii))
+            elif isinstance(item, (list, tuple)):
+                self.begin_array()
+                pending.append((_ARRAY, iter(item)))
+            elif isinstance(item, dict) or hasattr(item, "__dict__"):
+                self.begin_object()
+                pending.append((_OBJECT, iter((item if isinstance(item, dict) else vars(item)).items())))
+            else:
+                raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+    def flush(self):
+        """Envia o buffer pendente ao destino"""
+        self._drain()
+        if hasattr(self.fp, "flush"):
+            self.fp.flush()
+
+    def close(self):
+        """Verifica se todos os containers foram fechados e envia o restante"""
+        if self._containers:
+            raise ValueError(f"{len(self._containers)} container(s) JSON ainda abertos")
+        self.flush()
+
+
+def dump(obj, fp, indent=None, ensure_ascii=True):
+    """Equivalente a json.dump, sem recursão e escrevendo em blocos"""
+    writer = JsonStreamWriter(fp, indent=indent, ensure_ascii=ensure_ascii)
+    writer.value(obj)
+    writer.close()
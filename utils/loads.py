@@ -14,4 +14,9 @@ def load_data(file_path):
             return json.load(file)
     except json.JSONDecodeError as e:
         print(f"Erro ao decodificar o JSON: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# Função para salvar dados em JSON
+def save_data(file_path, data):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import threading
+from typing import Dict
+
+
+class SqliteLruCache:
+    """
+    Base dos caches persistentes em SQLite: uma conexão compartilhada entre
+    threads, contadores de acertos e remoção das entradas usadas há mais
+    tempo quando o total de bytes passa de `max_bytes`.
+
+    A tabela `table` precisa das colunas key, size e accessed_at.
+    """
+
+    table = ""
+    schema = ""
+
+    def __init__(self, db_path: str, max_bytes: int, timeout: float = 5.0):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # O Streamlit executa cada rerun em uma thread diferente
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=timeout)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._conn.executescript(self.schema)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em max_bytes (chamar com o lock)"""
+        total = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", stale)
+
+    def clear(self):
+        """Remove todas as entradas guardadas"""
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna as estatísticas de uso do cache"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+            }
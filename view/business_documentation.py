@@ -3,8 +3,12 @@ import os
 import shutil
 import subprocess
 import zipfile
+from contextlib import nullcontext
 import streamlit as st
 from utils.loads import load_data
+from processing.layers import LAYER_PATTERNS
+from processing.index_watcher import get_index_watcher
+from processing.project_model import default_index_path
 
 class BusinessDocumentation:
     def __init__(self, file_processor, class_processor, file_index_processor):
@@ -24,16 +28,7 @@ class BusinessDocumentation:
         self.file_index_processor = file_index_processor
         self.files_indexrs = load_data("file-to-analyze/index.json")
         # Lista de padrões de nomenclatura
-        self.patterns = [
-            "controller", "business", "model", "view", "api", "service", "resource", "event", "handler",
-            "listener", "microservice", "gateway", "proxy", "repository", "entity", "dto",
-            "dao", "aggregate", "valueobject", "factory", "specification", "test", "spec",
-            "mock", "stub", "fixture", "component", "directive", "module", "widget",
-            "middleware", "interceptor", "adapter", "logger", "monitor", "metrics", "auth",
-            "authorization", "authentication", "token", "config", "settings", "env",
-            "deployment", "schema", "migration", "seeder", "index", "layout", "template",
-            "style", "theme", "helper", "util", "common", "base", "core"
-        ]
+        self.patterns = list(LAYER_PATTERNS)
 
     def handle_project_input(self):
         """Gerenciar o upload de arquivos ZIP ou clonagem de repositórios Git."""
@@ -55,6 +50,12 @@ class BusinessDocumentation:
                 "Fazer o upload de um novo arquivo ou clonar um repositório irá substituir o conteúdo atual."
             )
 
+        incremental = st.checkbox(
+            "Atualização incremental",
+            value=True,
+            help="Mantém o índice de símbolos existente e reprocessa apenas os arquivos .cs adicionados ou alterados."
+        )
+
         if import_method == "Upload de Arquivo ZIP":
             # Gerenciar upload de arquivo ZIP
             uploaded_file = st.file_uploader(
@@ -64,23 +65,22 @@ class BusinessDocumentation:
             )
 
             if uploaded_file:
-                # Excluir arquivos existentes na pasta
-                if os.path.exists(target_dir):
-                    shutil.rmtree(target_dir)
-                os.makedirs(target_dir, exist_ok=True)
-
-                # Salvar e descompactar o arquivo .zip
-                with open(os.path.join(target_dir, "uploaded.zip"), "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                with zipfile.ZipFile(os.path.join(target_dir, "uploaded.zip"), "r") as zip_ref:
-                    zip_ref.extractall(target_dir)
-                os.remove(os.path.join(target_dir, "uploaded.zip"))
-
-                # Processar os arquivos extraídos
-                self.files_indexrs = self.file_index_processor.collect_cs_files()
-                self.file_index_processor.save_as_json(
-                    os.path.join(target_dir, "index.json")
-                )
+                # O monitor da pasta não deve indexar o projeto pela metade enquanto ele é substituído
+                with self._index_watcher_suspended(target_dir):
+                    # Excluir arquivos existentes na pasta (o índice de símbolos fica fora dela)
+                    if os.path.exists(target_dir):
+                        shutil.rmtree(target_dir)
+                    os.makedirs(target_dir, exist_ok=True)
+
+                    # Salvar e descompactar o arquivo .zip
+                    with open(os.path.join(target_dir, "uploaded.zip"), "wb") as f:
+                        f.write(uploaded_file.getbuffer())
+                    with zipfile.ZipFile(os.path.join(target_dir, "uploaded.zip"), "r") as zip_ref:
+                        zip_ref.extractall(target_dir)
+                    os.remove(os.path.join(target_dir, "uploaded.zip"))
+
+                    # Processar os arquivos extraídos
+                    self._reindex_project(target_dir, incremental=incremental)
 
                 st.success("Arquivo descompactado com sucesso!")
                 st.info(f"Os arquivos foram extraídos para a pasta '{target_dir}'.")
@@ -104,32 +104,60 @@ class BusinessDocumentation:
                     # Modificar a URL para incluir as credenciais
                     repo_url = repo_url.replace("https://", f"https://{username}:{token}@")
 
-            if st.button("Clonar Repositório"):
-                if repo_url:
-                    # Excluir arquivos existentes na pasta
-                    if os.path.exists(target_dir):
-                        shutil.rmtree(target_dir)
-                    os.makedirs(target_dir, exist_ok=True)
-
-                    # Clonar o repositório
+            if incremental and os.path.isdir(os.path.join(target_dir, ".git")):
+                if st.button("Atualizar Repositório (git pull)"):
                     try:
                         subprocess.run(
-                            ["git", "clone", repo_url, target_dir],
+                            ["git", "-C", target_dir, "pull"],
                             check=True,
                             text=True
                         )
-                        # Processar os arquivos clonados
-                        self.files_indexrs = self.file_index_processor.collect_cs_files()
-                        self.file_index_processor.save_as_json(
-                            os.path.join(target_dir, "index.json")
-                        )
-                        st.success("Repositório clonado com sucesso!")
-                        st.info(f"Os arquivos foram clonados para a pasta '{target_dir}'.")
+                        self._reindex_project(target_dir, incremental=True)
+                        st.success("Repositório atualizado com sucesso!")
                     except subprocess.CalledProcessError as e:
-                        st.error(f"Erro ao clonar o repositório: {e}")
+                        st.error(f"Erro ao atualizar o repositório: {e}")
+
+            if st.button("Clonar Repositório"):
+                if repo_url:
+                    # O monitor da pasta não deve indexar o projeto pela metade enquanto ele é substituído
+                    with self._index_watcher_suspended(target_dir):
+                        # Excluir arquivos existentes na pasta (o índice de símbolos fica fora dela)
+                        if os.path.exists(target_dir):
+                            shutil.rmtree(target_dir)
+                        os.makedirs(target_dir, exist_ok=True)
+
+                        # Clonar o repositório
+                        try:
+                            subprocess.run(
+                                ["git", "clone", repo_url, target_dir],
+                                check=True,
+                                text=True
+                            )
+                            # Processar os arquivos clonados
+                            self._reindex_project(target_dir, incremental=incremental)
+                            st.success("Repositório clonado com sucesso!")
+                            st.info(f"Os arquivos foram clonados para a pasta '{target_dir}'.")
+                        except subprocess.CalledProcessError as e:
+                            st.error(f"Erro ao clonar o repositório: {e}")
                 else:
                     st.error("Por favor, insira uma URL válida para o repositório.")
 
+    def _reindex_project(self, target_dir, incremental=False):
+        """Atualizar o index.json e o índice de símbolos da pasta do projeto."""
+        self.files_indexrs = self.file_index_processor.collect_cs_files()
+        self.file_index_processor.save_as_json(
+            os.path.join(target_dir, "index.json")
+        )
+        self.file_index_processor.save_symbol_index(
+            default_index_path(target_dir),
+            incremental=incremental
+        )
+
+    def _index_watcher_suspended(self, target_dir):
+        """Suspender o monitor da pasta, se existir, enquanto ela é substituída."""
+        watcher = get_index_watcher(target_dir)
+        return watcher.suspended() if watcher else nullcontext()
+
     def validate_inputs(self):
         """Validar os inputs obrigatórios com base no modo de execução."""
         errors = []
@@ -329,14 +357,10 @@ class BusinessDocumentation:
                 print(f"st.session_state.selected_patterns: {st.session_state.selected_patterns}")
                 # Processar dados no modo automatizado
                 if st.session_state.execution_mode == "Automatizado":
-                    json_data = self.class_processor.generate_json_report(self.main_class.get('path', None), 2, st.session_state.selected_patterns)
-                    if isinstance(json_data, str):
-                        try:
-                            json_data = json.loads(json_data)  # Converte a string JSON para um dicionário
-                        except json.JSONDecodeError as e:
-                            print(f"Erro ao decodificar JSON: {e}")
-                            json_data = {}  # Define um dicionário vazio como fallback
+                    # Estrutura já em dicionário: evita serializar o relatório e decodificá-lo de volta
+                    json_data = self.class_processor.build_json_report(self.main_class.get('path', None), 2, st.session_state.selected_patterns)
                     domain_structure["dependencies"] = json_data.get('dependencies', {})
+                    domain_structure["documentation_order"] = json_data.get('documentation_order', [])
                     st.session_state.domain_structure = domain_structure  # Atualizar no estado da sessão
     
         # Renderizar tabela apenas se as configurações foram salvas
@@ -388,6 +412,12 @@ class BusinessDocumentation:
                 disabled=True  # Desabilitar edição
             )
 
+            self.file_processor.use_result_cache = st.checkbox(
+                "Reutilizar respostas em cache",
+                value=True,
+                help="Quando o prompt não mudou, reaproveita a resposta anterior da StackSpot AI sem chamar a API."
+            )
+
             # Botão para processar os arquivos
             if st.button("Processar Arquivos"):
                 # Processar todos os arquivos listados
@@ -407,7 +437,41 @@ class BusinessDocumentation:
                     # st.json(domain_structure)
                     self.file_processor.process_json(domain_structure)
                 else:
-                    st.warning("Nenhum arquivo encontrado para processamento.")        
+                    st.warning("Nenhum arquivo encontrado para processamento.")
+
+            # Configuração salva em JSON, para documentar vários domínios de uma vez
+            st.download_button(
+                "Baixar Configuração do Domínio (JSON)",
+                data=json.dumps(domain_structure, ensure_ascii=False, indent=2),
+                file_name=f"{(domain_structure['metadata'].get('name') or 'dominio').replace(' ', '_').lower()}.json",
+                mime="application/json",
+            )
+
+    def render_batch_section(self):
+        """Documentar vários domínios de uma vez a partir das configurações salvas em JSON."""
+        st.subheader("Documentar Vários Domínios")
+        uploaded_files = st.file_uploader(
+            "Configurações de domínio (.json)",
+            type="json",
+            accept_multiple_files=True,
+            help="Arquivos gerados por 'Baixar Configuração do Domínio'; as execuções são enviadas em paralelo."
+        )
+        if uploaded_files and st.button("Processar Domínios"):
+            results = {}
+            domains = {}
+            for position, uploaded_file in enumerate(uploaded_files):
+                try:
+                    domains[position] = json.loads(uploaded_file.getvalue())
+                except ValueError as e:
+                    results[position] = e
+            # process_many_json devolve uma resposta por JSON, na ordem recebida
+            results.update(zip(domains, self.file_processor.process_many_json(list(domains.values()))))
+            for position, uploaded_file in enumerate(uploaded_files):
+                result = results[position]
+                if isinstance(result, Exception):
+                    st.error(f"{uploaded_file.name}: {result}")
+                else:
+                    st.success(f"{uploaded_file.name}: documentação gerada.")
 
     def render(self):
         """Renderizar toda a interface da documentação de negócio."""
@@ -417,3 +481,4 @@ class BusinessDocumentation:
         self.render_main_class_section()
         self.render_dependencies_section()
         self.render_actions()
+        self.render_batch_section()